@@ -1,12 +1,13 @@
 import asyncio
+import time
 from simpx import BotProfile, SimpleXBot
 from simpx.extension import ChatWrapper
 from typing import List
 import traceback
 
 try:
-  from openai import OpenAI
-  aiclient = OpenAI(
+  from openai import AsyncOpenAI
+  aiclient = AsyncOpenAI(
     base_url="https://openrouter.ai/api/v1",
     api_key="<API_KEY_HERE>",
   )
@@ -15,6 +16,11 @@ except ImportError:
 
 CHAT_MODEL = "google/gemini-2.0-flash-lite-001"
 
+# Streamed text is sent to the live message at most this often (seconds),
+# or sooner once this many new characters are pending
+LIVE_UPDATE_INTERVAL = 0.15
+LIVE_UPDATE_CHARS = 64
+
 # Example usage
 if __name__ == "__main__":
     
@@ -78,10 +84,12 @@ if __name__ == "__main__":
               initial_text = "Processing your request..."
               live_msg = await bot.send_message(chat, initial_text, live=True, ttl=60)
               current_response = ""
-              
+              last_flush = time.monotonic()
+              pending = 0
               
               # Create the chat completion request with streaming enabled.
-              response = aiclient.chat.completions.create(
+              # The async client keeps the event loop free for other chats while streaming.
+              response = await aiclient.chat.completions.create(
                   model=CHAT_MODEL,
                   messages=[
                       {
@@ -98,16 +106,24 @@ if __name__ == "__main__":
               )
               
               # Process each streaming chunk.
-              for chunk in response:
+              async for chunk in response:
                   # Extract text content from the current chunk.
                   # Assumes chunk structure similar to OpenAI's streaming response.
                   chunk_text = chunk.choices[0].delta.content or ""
                   if chunk_text:
                       current_response += chunk_text
-                      # Update the live message with the accumulated response.
-                      await live_msg.update_live(f"{current_response}")
+                      pending += len(chunk_text)
+                      # Update the live message with the accumulated response,
+                      # coalescing chunks that arrive in quick succession.
+                      if (pending >= LIVE_UPDATE_CHARS or
+                              time.monotonic() - last_flush > LIVE_UPDATE_INTERVAL):
+                          await live_msg.update_live(current_response)
+                          last_flush = time.monotonic()
+                          pending = 0
               
-              # Finalize the live message.
+              # Send whatever is still pending, then finalize the live message.
+              if pending:
+                  await live_msg.update_live(current_response)
               await live_msg.finish_live()
           
           except Exception as e:
@@ -116,5 +132,5 @@ if __name__ == "__main__":
               await live_msg.finish_live()
 
     # Start the bot
-    asyncio.run(bot.start())
+    bot.run()
 
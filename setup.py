@@ -25,4 +25,7 @@ setup(
         "websockets",
         "qrcode"
     ],
+    extras_require={
+        "speedups": ["orjson", "uvloop; sys_platform != 'win32'"],
+    },
 )
@@ -1,10 +1,13 @@
 import asyncio
+import logging
 import random
 import functools
 import inspect
 import re
-from typing import Dict, List, Callable, Optional, Any, Union, TypeVar, Pattern, Awaitable
-import traceback
+import string
+import sys
+from types import MappingProxyType
+from typing import Dict, List, Callable, Optional, Any, Union, TypeVar, Pattern, Awaitable, Tuple
 
 from .client import ChatClient, ChatCommandError
 from .command import ChatType
@@ -16,8 +19,209 @@ from .extension import (
     ChatWrapper, UserWrapper, ChatItemWrapper, ScheduledTask
 )
 
+logger = logging.getLogger(__name__)
+
+# Parses welcome message templates, see _name_template_segments
+_FORMATTER = string.Formatter()
+
+def _name_template_segments(template: str) -> Optional[List[str]]:
+    """
+    Split a str.format template into the literal text around its {name} fields.
+    
+    Args:
+        template: The template to split
+        
+    Returns:
+        The literal segments, with {{ and }} unescaped, or None if the template
+        is malformed or has fields other than a plain {name}
+    """
+    segments = []
+    literal = []
+    try:
+        for text, field, spec, conversion in _FORMATTER.parse(template):
+            literal.append(text)
+            if field is None:
+                continue
+            if field != "name" or spec or conversion:
+                return None
+            segments.append("".join(literal))
+            literal = []
+    except ValueError:
+        return None
+    segments.append("".join(literal))
+    return segments
+
 T = TypeVar('T')
 CommandCallback = Callable[..., Awaitable[Any]]
+# Builds a handler's keyword arguments from (bot, chat_info, chat_item, kwargs)
+Binder = Callable[[Any, ChatInfo, ChatItem, Dict[str, Any]], Dict[str, Any]]
+# A registered command: (handler, binder)
+CommandEntry = Tuple[CommandCallback, Binder]
+
+# Response and chat info type names compared on every message
+_NEW_CHAT_ITEMS = sys.intern("newChatItems")
+_CONTACT_CONNECTED = sys.intern("contactConnected")
+_DIRECT = sys.intern("direct")
+_GROUP = sys.intern("group")
+
+# Server events about chat items, which leave the chat list unchanged
+_CHAT_ITEM_EVENTS = frozenset(map(sys.intern, (
+    "newChatItems", "chatItemUpdated", "chatItemsDeleted",
+    "chatItemReaction", "chatItemsStatusesUpdated",
+)))
+
+# Maximum number of chats whose new items are handled concurrently
+_MAX_CONCURRENT_CHATS = 16
+
+# Number of command texts whose pattern match result is remembered
+_DISPATCH_CACHE_SIZE = 1024
+
+# Marks a command text that is not in the dispatch cache
+_MISS = object()
+
+# Chat types, bound once instead of resolving the enum members on each use
+_CT_DIRECT = ChatType.Direct
+_CT_GROUP = ChatType.Group
+
+# Shared read-only fallback for missing nested objects
+_EMPTY = MappingProxyType({})
+
+# Chat item directions of messages sent by the bot itself
+_SENT_DIRS = frozenset((sys.intern("directSnd"), sys.intern("groupSnd")))
+
+# Where a command handler parameter gets its value from
+_SRC_KWARG = 0
+_SRC_CHAT_INFO = 1
+_SRC_CHAT_ITEM = 2
+_SRC_BOT = 3
+_SRC_CLIENT = 4
+_SRC_PROFILE = 5
+
+# Parameter names that are filled from the dispatch context rather than from
+# the command arguments
+_CONTEXT_PARAMS = {
+    "chat_info": _SRC_CHAT_INFO,
+    "chat_item": _SRC_CHAT_ITEM,
+    "bot": _SRC_BOT,
+    "client": _SRC_CLIENT,
+    "profile": _SRC_PROFILE,
+}
+
+# How each context source is read from (bot, chat_info, chat_item)
+_CONTEXT_GETTERS = {
+    _SRC_CHAT_INFO: lambda bot, chat_info, chat_item: chat_info,
+    _SRC_CHAT_ITEM: lambda bot, chat_info, chat_item: chat_item,
+    _SRC_BOT: lambda bot, chat_info, chat_item: bot,
+    _SRC_CLIENT: lambda bot, chat_info, chat_item: bot.client,
+    _SRC_PROFILE: lambda bot, chat_info, chat_item: bot.profile_manager.current_profile,
+}
+
+# Backreferences by group number change meaning once a pattern is nested in
+# the combined command pattern
+_NUMBERED_BACKREF = re.compile(r"\\[1-9]|\(\?\(\d")
+
+# Group names in a pattern: definitions (?P<name>, backreferences (?P=name)
+# and conditionals (?(name), unless the opening parenthesis is escaped
+_GROUP_NAME_REF = re.compile(r"(?<!\\)((?:\\\\)*\(\?)(P<|P=|\()([^\W\d]\w*)(?=[>)])")
+
+@functools.lru_cache(maxsize=256)
+def _compile_pattern(pattern: str) -> Pattern:
+    """Compile a command pattern, reusing the result for repeated patterns."""
+    return re.compile(pattern)
+
+def _binding_plan(func: CommandCallback) -> Tuple[List[Tuple[str, int]], bool]:
+    """
+    Resolve how each parameter of a command handler gets its value.
+    
+    This is done once when the handler is registered so that dispatching a
+    command does not need to introspect the handler's signature.
+    
+    Args:
+        func: The command handler function
+        
+    Returns:
+        A tuple of the plan and whether the handler accepts **kwargs. The plan
+        is a list of (param_name, source) tuples, where the source is one of
+        the _SRC_* constants.
+    """
+    plan = []
+    has_var_kw = False
+    for param_name, param in inspect.signature(func).parameters.items():
+        if param_name == 'self':
+            continue
+        elif param_name in _CONTEXT_PARAMS:
+            plan.append((param_name, _CONTEXT_PARAMS[param_name]))
+        elif param.kind == inspect.Parameter.VAR_KEYWORD:
+            has_var_kw = True
+        elif param.kind != inspect.Parameter.VAR_POSITIONAL:
+            # Filled from the command arguments when present, otherwise the
+            # parameter's default (if any) applies
+            plan.append((param_name, _SRC_KWARG))
+    return plan, has_var_kw
+
+def _make_binder(plan: List[Tuple[str, int]], has_var_kw: bool) -> Binder:
+    """
+    Build a function that assembles a handler's keyword arguments.
+    
+    The returned function is specialized for the handler's binding plan, so
+    dispatching a command does not branch on each parameter's source.
+    
+    Args:
+        plan: The binding plan from _binding_plan
+        has_var_kw: Whether the handler accepts **kwargs
+        
+    Returns:
+        A function taking (bot, chat_info, chat_item, kwargs) and returning the
+        keyword arguments for the handler
+    """
+    getters = tuple((name, _CONTEXT_GETTERS[source]) for name, source in plan if source != _SRC_KWARG)
+    kwarg_names = tuple(name for name, source in plan if source == _SRC_KWARG)
+    
+    if has_var_kw:
+        # All command arguments are passed through
+        def bind(bot, chat_info, chat_item, kwargs):
+            handler_kwargs = {name: get(bot, chat_info, chat_item) for name, get in getters}
+            handler_kwargs.update(kwargs)
+            return handler_kwargs
+    elif kwarg_names:
+        def bind(bot, chat_info, chat_item, kwargs):
+            handler_kwargs = {name: get(bot, chat_info, chat_item) for name, get in getters}
+            for name in kwarg_names:
+                if name in kwargs:
+                    handler_kwargs[name] = kwargs[name]
+            return handler_kwargs
+    else:
+        # Only context parameters
+        def bind(bot, chat_info, chat_item, kwargs):
+            return {name: get(bot, chat_info, chat_item) for name, get in getters}
+    return bind
+
+def _classify(msg_text: str, prefix: str, prefix_len: int) -> Optional[Tuple[str, str, str]]:
+    """
+    Split a message into its command parts in one pass.
+    
+    Args:
+        msg_text: The message text
+        prefix: The command prefix
+        prefix_len: The length of the command prefix
+        
+    Returns:
+        A (command_text, command_name, args) tuple, where command_text is the
+        message without the prefix, or None if the message is not a command
+    """
+    if not msg_text.startswith(prefix):
+        return None
+    command_text = msg_text[prefix_len:]
+    # Common case: the name is separated by a plain space. A non-empty,
+    # printable name contains no other whitespace, so this gives the same
+    # result as str.split
+    name, _, args = command_text.partition(" ")
+    if name and name.isprintable():
+        return command_text, name, args.lstrip()
+    parts = command_text.split(maxsplit=1)
+    if not parts:
+        return None
+    return command_text, parts[0], parts[1] if len(parts) > 1 else ""
 
 class SimpleXBot:
     """
@@ -39,20 +243,34 @@ class SimpleXBot:
         self.server_url = server_url
         self.client = None
         self.running = False
-        self._event_handlers: Dict[str, List[Callable]] = {}
-        self._command_handlers: Dict[Union[str, Pattern], CommandCallback] = {}
+        # Handlers are stored as tuples, which are rebuilt on registration
+        self._event_handlers: Dict[str, Tuple[Callable, ...]] = {}
+        self._exact_handlers: Dict[str, CommandEntry] = {}
+        self._pattern_handlers: List[Tuple[Pattern, CommandEntry]] = []
+        self._combined_pattern: Optional[Pattern] = None
+        # Branch name -> (entry, [(group name in the combined pattern, handler's group name)])
+        self._combined_branches: Dict[str, Tuple[CommandEntry, List[Tuple[str, str]]]] = {}
+        self._combined_stale = False
+        self._dispatch_cache: Dict[str, Optional[Tuple[CommandEntry, Dict[str, Any]]]] = {}
         self._command_prefix = "!"
+        self._prefix_len = 1
         self._help_command_enabled = True
         self._help_command_text = {}
+        self._sorted_help_keys: Tuple[str, ...] = ()
+        # Rendered help replies, rebuilt lazily after commands or the prefix change
+        self._help_text_cache: Optional[str] = None
+        self._help_detail_cache: Dict[str, str] = {}
         self._welcome_message = None
+        self._welcome_render: Callable[[str], str] = lambda name: ""
+        self._welcome_handler: Optional[Callable] = None
         self._auto_read_messages = True  # Default to auto-read messages
 
         if profile:
             self.profile_manager.add_profile(profile, "default")
             if profile.welcome_message:
-                self._welcome_message = profile.welcome_message
+                self._set_welcome_template(profile.welcome_message)
             if profile.command_prefix:
-                self._command_prefix = profile.command_prefix
+                self.set_command_prefix(profile.command_prefix)
         
         self.ext = None
 
@@ -70,9 +288,9 @@ class SimpleXBot:
         if profile:
             self.profile_manager.add_profile(profile, "default")
             if profile.welcome_message:
-                self._welcome_message = profile.welcome_message
+                self._set_welcome_template(profile.welcome_message)
             if profile.command_prefix:
-                self._command_prefix = profile.command_prefix
+                self.set_command_prefix(profile.command_prefix)
         
         # Initialize the client with profile - will use existing profile if available
         self.client = await self.profile_manager.initialize(server_url=self.server_url)
@@ -83,22 +301,44 @@ class SimpleXBot:
         # Update bot configuration from the current profile
         if self.profile_manager.current_profile:
             if self.profile_manager.current_profile.welcome_message and not self._welcome_message:
-                self._welcome_message = self.profile_manager.current_profile.welcome_message
+                self._set_welcome_template(self.profile_manager.current_profile.welcome_message)
             if self.profile_manager.current_profile.command_prefix:
-                self._command_prefix = self.profile_manager.current_profile.command_prefix
-        
-        # Register built-in help command if enabled
-        if self._help_command_enabled:
-            self._register_help_command()
+                self.set_command_prefix(self.profile_manager.current_profile.command_prefix)
         
-        # Register default welcome message handler if one is set
-        if self._welcome_message:
-            self._register_welcome_handler()
+        self._install_builtins()
         
         # Start processing messages
         self.running = True
         await self._process_messages()
     
+    def run(self, profile: Optional[BotProfile] = None, use_uvloop: bool = True):
+        """
+        Run the bot in a new event loop until it stops.
+        
+        When use_uvloop is set and uvloop is installed, the bot runs on a uvloop
+        event loop; otherwise the default asyncio loop is used. The process-wide
+        event loop policy is left unchanged either way.
+        
+        Args:
+            profile: The bot profile to use (overrides the one set in constructor)
+            use_uvloop: Whether to use uvloop if it is available
+        """
+        if use_uvloop:
+            try:
+                import uvloop
+            except ImportError:
+                uvloop = None
+            if uvloop is not None:
+                if hasattr(uvloop, "run"):
+                    uvloop.run(self.start(profile))
+                    return
+                # uvloop.run() was added in uvloop 0.18
+                if hasattr(asyncio, "Runner"):
+                    with asyncio.Runner(loop_factory=uvloop.new_event_loop) as runner:
+                        runner.run(self.start(profile))
+                    return
+        asyncio.run(self.start(profile))
+    
     def set_auto_read(self, enabled: bool):
         """
         Enable or disable automatic message reading.
@@ -110,67 +350,105 @@ class SimpleXBot:
         """
         self._auto_read_messages = enabled
 
+    def _install_builtins(self):
+        """Register the enabled built-in commands and event handlers."""
+        # Register built-in help command if enabled
+        if self._help_command_enabled:
+            self._register_help_command()
+        
+        # Register default welcome message handler if one is set
+        if self._welcome_message:
+            self._register_welcome_handler()
+    
     def _register_help_command(self):
-        """Register the built-in help command."""
+        """
+        Register the built-in help command.
+        
+        The command entry is stored directly with a fixed binding plan rather
+        than going through the command() decorator.
+        """
         async def help_command(chat_info, chat_item, **kwargs):
             command = kwargs.get('args', '').strip()
             if command:
                 # Show help for specific command
-                help_text = self._help_command_text.get(command)
+                name = command.lower()
+                help_text = self._help_detail_cache.get(name)
+                if help_text is None and name in self._help_command_text:
+                    help_text = f"*{self._command_prefix}{name}*\n{self._help_command_text[name]}"
+                    self._help_detail_cache[name] = help_text
                 if help_text:
-                    await self.send_message(chat_info, f"*{self._command_prefix}{command}*\n{help_text}")
+                    await self.send_message(chat_info, help_text)
                 else:
                     await self.send_message(chat_info, f"No help available for command `{command}`")
             else:
                 # Show general help
-                commands = list(self._help_command_text.keys())
-                if commands:
-                    help_text = "Available commands:\n" + "\n".join(f"*{self._command_prefix}{cmd}* - {self._help_command_text[cmd].split('.')[0]}." for cmd in sorted(commands))
-                    await self.send_message(chat_info, help_text)
-                else:
-                    await self.send_message(chat_info, "No commands available.")
+                help_text = self._help_text_cache
+                if help_text is None:
+                    help_texts = self._help_command_text
+                    if help_texts:
+                        help_text = "Available commands:\n" + "\n".join(f"*{self._command_prefix}{cmd}* - {help_texts[cmd].split('.')[0]}." for cmd in self._sorted_help_keys)
+                    else:
+                        help_text = "No commands available."
+                    self._help_text_cache = help_text
+                await self.send_message(chat_info, help_text)
         
-        self.command("help", help="Shows this help message")(help_command)
+        self._exact_handlers["help"] = (help_command, _make_binder([("chat_info", _SRC_CHAT_INFO), ("chat_item", _SRC_CHAT_ITEM)], True))
+        self._set_help_text("help", "Shows this help message")
     
     def _register_welcome_handler(self):
-        """Register the default welcome message handler."""
-        @self.event("contactConnected")
+        """
+        Register the default welcome message handler.
+        
+        The handler is only registered once. It renders whichever welcome
+        message is current, so later profile switches need no new handler.
+        """
+        if self._welcome_handler is not None:
+            return
+        
         async def on_contact_connected(response):
             contact = response.get("contact", {})
             display_name = contact.get("profile", {}).get("displayName", "Unknown")
             contact_id = contact.get("contactId")
             
-            print(f"{display_name} connected")
+            logger.info("%s connected", display_name)
             
             # Format the welcome message with the contact's display name
-            message = self._welcome_message
-            if "{name}" in message:
-                message = message.format(name=display_name)
+            message = self._welcome_render(display_name)
             
             # Send welcome message
             await self.client.api_send_text_message(
-                ChatType.Direct,
+                _CT_DIRECT,
                 contact_id,
                 message
             )
+        
+        self._welcome_handler = on_contact_connected
+        self._add_event_handler(_CONTACT_CONNECTED, on_contact_connected)
 
     async def _process_messages(self):
         """Process incoming messages and dispatch events."""
+        msg_q = self.client.msg_q
+        try_dequeue = msg_q.try_dequeue
+        dequeue = msg_q.dequeue
+        dispatch = self._dispatch_event
         while self.running:
             try:
-                response = await self.client.msg_q.dequeue()
+                # Take an already queued message without suspending, and only
+                # wait on the queue when it is empty
+                response = try_dequeue()
+                if response is None:
+                    response = await dequeue()
                 
                 # Skip processing if we got None or an empty response
                 if not response:
                     continue
                     
                 # Debug logging to understand the response structure
-                print(f"Received message of type: {response.get('type')}")
+                logger.debug("Received message of type: %s", response.get('type'))
                 
-                await self._dispatch_event(response)
-            except Exception as e:
-                print(f"Error processing message: {e}")
-                traceback.print_exc()
+                await dispatch(response)
+            except Exception:
+                logger.exception("Error processing message")
                 # Add a small delay to prevent tight error loops
                 await asyncio.sleep(0.1)
 
@@ -183,162 +461,296 @@ class SimpleXBot:
         """
         response_type = response.get("type")
         
+        # Other events may add, remove or change contacts, groups or requests
+        if self.ext is not None and response_type not in _CHAT_ITEM_EVENTS:
+            self.ext.invalidate_chats_cache()
+        
         # Call registered event handlers for this response type
-        handlers = self._event_handlers.get(response_type, [])
-        for handler in handlers:
-            try:
-                await handler(response)
-            except Exception as e:
-                print(f"Error in event handler for {response_type}: {e}")
+        handlers = self._event_handlers.get(response_type)
+        if handlers:
+            for handler in handlers:
+                try:
+                    await handler(response)
+                except Exception:
+                    logger.exception("Error in event handler for %s", response_type)
         
         # Special handling for new chat items (messages)
-        if response_type == "newChatItems":
+        if response_type == _NEW_CHAT_ITEMS:
             await self._handle_new_chat_items(response)
 
     async def _handle_new_chat_items(self, response: ChatResponse):
         """
         Handle new chat items (messages).
         
+        Items from the same chat are handled in order, while items from
+        different chats are handled concurrently.
+        
         Args:
             response: The 'newChatItems' response
         """
-        print(f"Processing {len(response.get('chatItems', []))} new chat items")
+        if "chatItems" not in response:
+            return
+        chat_items = response["chatItems"]
+        logger.debug("Processing %d new chat items", len(chat_items))
         
-        for chat_item_data in response.get("chatItems", []):
+        items_by_chat: Dict[Tuple[Optional[ChatType], Optional[int]], List[AChatItem]] = {}
+        for chat_item_data in chat_items:
             try:
-                chat_info = chat_item_data.get("chatInfo", {})
-                chat_item = chat_item_data.get("chatItem", {})
+                chat_ref = self._chat_ref(chat_item_data["chatInfo"])
+            except KeyError:
+                continue
+            items_by_chat.setdefault(chat_ref, []).append(chat_item_data)
+        
+        if len(items_by_chat) == 1:
+            # Nothing to overlap with
+            chat_ref, items = next(iter(items_by_chat.items()))
+            await self._handle_chat_items(chat_ref, items)
+            return
+        
+        # Cap how many chats are handled at once so a large batch doesn't
+        # flood the client with concurrent commands
+        limit = asyncio.Semaphore(_MAX_CONCURRENT_CHATS)
+        
+        async def handle_limited(chat_ref, items):
+            async with limit:
+                await self._handle_chat_items(chat_ref, items)
+        
+        results = await asyncio.gather(
+            *(handle_limited(chat_ref, items) for chat_ref, items in items_by_chat.items()),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error("Error processing chat items", exc_info=result)
+    
+    async def _handle_chat_items(self, chat_ref: Tuple[Optional[ChatType], Optional[int]], chat_items: List[AChatItem]):
+        """
+        Handle the new chat items of a single chat, one after another.
+        
+        Args:
+            chat_ref: The (chat_type, chat_id) of the chat
+            chat_items: The chat items, in the order they were received
+        """
+        prefix = self._command_prefix
+        prefix_len = self._prefix_len
+        debug = logger.isEnabledFor(logging.DEBUG)
+        auto_read = self._auto_read_messages
+        read_ids: List[int] = []
+        
+        for chat_item_data in chat_items:
+            try:
+                # Items missing any of the required fields are skipped
+                try:
+                    chat_info = chat_item_data["chatInfo"]
+                    chat_item = chat_item_data["chatItem"]
+                    dir_type = chat_item["chatDir"]["type"]
+                    content = chat_item["content"]
+                except KeyError:
+                    continue
                 
-                # Debug message
-                dir_type = chat_item.get("chatDir", {}).get("type", "unknown")
-                print(f"Processing message with direction: {dir_type}")
+                if debug:
+                    logger.debug("Processing message with direction: %s", dir_type)
                 
                 # Only process received messages, not ones we sent
                 # Skip processing sent messages (those with directSnd or groupSnd direction)
-                if dir_type.startswith("directSnd") or dir_type.startswith("groupSnd"):
-                    print("Skipping sent message")
+                if dir_type in _SENT_DIRS:
+                    if debug:
+                        logger.debug("Skipping sent message")
                     continue
                 
                 # Get message content
-                content = chat_item.get("content", {})
                 msg_text = ci_content_text(content)
                 
                 if not msg_text:
-                    print("Message has no text content, skipping")
+                    if debug:
+                        logger.debug("Message has no text content, skipping")
                     continue
                     
-                print(f"Processing message: {msg_text[:30]}...")
+                if debug:
+                    logger.debug("Processing message: %s...", msg_text[:30])
                 
-                # Check if it's a command
-                if msg_text.startswith(self._command_prefix):
-                    print(f"Handling command: {msg_text}")
-                    await self._handle_command(msg_text[len(self._command_prefix):], chat_info, chat_item)
+                # Auto-read messages if enabled. They are marked read after the
+                # whole batch is processed, even if their command handler fails
+                if auto_read:
+                    item_id = (chat_item.get("meta") or _EMPTY).get("itemId")
+                    if item_id:
+                        read_ids.append(item_id)
                 
-                # Auto-read messages if enabled (after processing)
-                if self._auto_read_messages:
-                    await self._mark_chat_item_as_read(chat_info, chat_item)
+                # Check if it's a command
+                command = _classify(msg_text, prefix, prefix_len)
+                if command is not None:
+                    if debug:
+                        logger.debug("Handling command: %s", msg_text)
+                    await self._handle_command(*command, chat_info, chat_item)
                     
-            except Exception as e:
-                print(f"Error processing chat item: {e}")
+            except Exception:
+                # Also catches errors raised by command handlers
+                logger.exception("Error processing chat item")
+        
+        # Mark all processed items of this chat as read at once
+        if read_ids:
+            await self._mark_chat_items_as_read(chat_ref, read_ids)
     
-    async def _mark_chat_item_as_read(self, chat_info: ChatInfo, chat_item: ChatItem):
-        """Mark a specific chat item as read."""
-        try:
-            chat_type = None
-            chat_id = None
+    @staticmethod
+    def _chat_ref(chat_info: ChatInfo) -> Tuple[Optional[ChatType], Optional[int]]:
+        """Get the chat type and ID of a direct or group chat, or (None, None)."""
+        chat_type = chat_info.get("type")
+        if chat_type == _DIRECT:
+            return _CT_DIRECT, (chat_info.get("contact") or _EMPTY).get("contactId")
+        elif chat_type == _GROUP:
+            return _CT_GROUP, (chat_info.get("groupInfo") or _EMPTY).get("groupId")
+        return None, None
+    
+    def chat_ref(self, chat_info: ChatInfo) -> Tuple[Optional[ChatType], Optional[int]]:
+        """
+        Resolve the chat type and ID of a chat once, for repeated replies.
+        
+        Args:
+            chat_info: The chat info
             
-            if chat_info.get("type") == "direct":
-                chat_type = ChatType.Direct
-                chat_id = chat_info.get("contact", {}).get("contactId")
-            elif chat_info.get("type") == "group":
-                chat_type = ChatType.Group
-                chat_id = chat_info.get("groupInfo", {}).get("groupId")
+        Returns:
+            A (chat_type, chat_id) tuple that can be passed to send_message,
+            or (None, None) if the chat is neither a direct nor a group chat
+        """
+        return self._chat_ref(chat_info)
+    
+    async def _mark_chat_items_as_read(self, chat_ref: Tuple[Optional[ChatType], Optional[int]], item_ids: List[int]):
+        """
+        Mark chat items of one chat as read with a single command.
+        
+        Args:
+            chat_ref: The (chat_type, chat_id) of the chat
+            item_ids: The IDs of the chat items to mark as read
+        """
+        try:
+            chat_type, chat_id = chat_ref
             
-            if chat_type and chat_id and chat_item.get("meta", {}).get("itemId"):
-                item_id = chat_item["meta"]["itemId"]
-                
-                # Create an item range for this specific message
-                item_range = {
-                    "fromItem": 0,
-                    "toItem": item_id
-                }
-                
-                await self.client.api_chat_read(chat_type, chat_id, item_id)
-        except Exception as e:
-            print(f"Error marking message as read: {e}")
+            if chat_type and chat_id:
+                await self.client.api_chat_read(chat_type, chat_id, item_ids)
+        except Exception:
+            logger.exception("Error marking message as read")
     
-    async def _handle_command(self, command_text: str, chat_info: ChatInfo, chat_item: ChatItem):
+    async def _handle_command(self, command_text: str, command_name: str, args: str, chat_info: ChatInfo, chat_item: ChatItem):
         """
         Handle a command message.
         
         Args:
             command_text: The command text without prefix
+            command_name: The first word of the command text
+            args: The rest of the command text
             chat_info: The chat info
             chat_item: The chat item containing the command
         """
-        # Split the command into the command name and arguments
-        parts = command_text.split(maxsplit=1)
-        command_name = parts[0].lower()
-        args = parts[1] if len(parts) > 1 else ""
+        # Check for exact command matches first. Names are registered in
+        # lowercase, so only lowercase what was typed if it doesn't match as-is
+        entry = self._exact_handlers.get(command_name)
+        if entry is None and not command_name.islower():
+            entry = self._exact_handlers.get(command_name.lower())
+        if entry is not None:
+            await self._call_command_handler(entry, chat_info, chat_item, args=args)
+            return
         
-        # Check for exact command matches first
-        if command_name in self._command_handlers:
-            handler = self._command_handlers[command_name]
-            await self._call_command_handler(handler, chat_info, chat_item, args=args)
+        if not self._pattern_handlers:
             return
         
-        # Then check for regex pattern matches
-        for pattern, handler in self._command_handlers.items():
-            if isinstance(pattern, Pattern) and pattern.match(command_text):
-                match = pattern.match(command_text)
-                if match:
-                    kwargs = match.groupdict()
-                    await self._call_command_handler(handler, chat_info, chat_item, **kwargs)
+        # Then check for regex pattern matches. Repeated command texts reuse
+        # the earlier result, including the fact that nothing matched
+        cached = self._dispatch_cache.get(command_text, _MISS)
+        if cached is _MISS:
+            cached = self._match_pattern(command_text)
+            if len(self._dispatch_cache) >= _DISPATCH_CACHE_SIZE:
+                self._dispatch_cache.clear()
+            self._dispatch_cache[command_text] = cached
+        
+        if cached is not None:
+            entry, kwargs = cached
+            await self._call_command_handler(entry, chat_info, chat_item, **kwargs)
+    
+    def _match_pattern(self, command_text: str) -> Optional[Tuple[CommandEntry, Dict[str, Any]]]:
+        """
+        Find the pattern command matching a command text.
+        
+        A single match against the combined pattern is used when all patterns
+        could be combined.
+        
+        Args:
+            command_text: The command text without prefix
+            
+        Returns:
+            The matching command entry and its named groups, or None
+        """
+        if self._combined_stale:
+            self._rebuild_combined_pattern()
+        
+        if self._combined_pattern is not None:
+            match = self._combined_pattern.match(command_text)
+            if match:
+                entry, group_names = self._combined_branches[match.lastgroup]
+                return entry, {name: match.group(branch_group) for branch_group, name in group_names}
+            return None
+        
+        for pattern, entry in self._pattern_handlers:
+            if (match := pattern.match(command_text)) is not None:
+                return entry, match.groupdict()
+        return None
+    
+    def _rebuild_combined_pattern(self):
+        """
+        Combine all registered command patterns into a single alternation.
+        
+        Each pattern becomes a named branch, so one match selects the handler
+        in registration order. Named groups are prefixed with their branch name,
+        so patterns may reuse the same group names. Patterns that cannot be
+        combined safely (inline flags, numbered backreferences) leave the
+        combined pattern unset and dispatch falls back to matching them one by one.
+        """
+        self._combined_stale = False
+        self._combined_pattern = None
+        self._combined_branches = {}
+        
+        branches = []
+        for i, (pattern, entry) in enumerate(self._pattern_handlers):
+            if pattern.flags & ~re.UNICODE or _NUMBERED_BACKREF.search(pattern.pattern):
+                return
+            branch_name = f"_cmd{i}"
+            renames = {name: f"{branch_name}_{name}" for name in pattern.groupindex}
+            source = _GROUP_NAME_REF.sub(
+                lambda m: m.group(1) + m.group(2) + renames.get(m.group(3), m.group(3)),
+                pattern.pattern
+            ) if renames else pattern.pattern
+            # Check that exactly the group definitions were renamed
+            if renames:
+                try:
+                    renamed = re.compile(source)
+                except re.error:
+                    return
+                if (renamed.groups != pattern.groups or
+                        renamed.groupindex != {renames[name]: index for name, index in pattern.groupindex.items()}):
                     return
+            branches.append(f"(?P<{branch_name}>{source})")
+            self._combined_branches[branch_name] = (entry, [(renames[name], name) for name in pattern.groupindex])
+        
+        try:
+            self._combined_pattern = re.compile("|".join(branches))
+        except re.error:
+            self._combined_branches = {}
     
-    async def _call_command_handler(self, handler: CommandCallback, chat_info: ChatInfo, chat_item: ChatItem, **kwargs):
+    async def _call_command_handler(self, entry: CommandEntry, chat_info: ChatInfo, chat_item: ChatItem, **kwargs):
         """
         Call a command handler with the appropriate arguments.
         
-        This method inspects the handler's signature and passes only the
-        parameters that it accepts.
+        The binder built at registration time passes only the parameters that
+        the handler accepts. Errors raised by the handler propagate to the
+        chat item loop, which logs them.
         
         Args:
-            handler: The command handler function
+            entry: The (handler, binder) entry registered for the command
             chat_info: The chat info
             chat_item: The chat item
             **kwargs: Additional keyword arguments
         """
-        try:
-            sig = inspect.signature(handler)
-            handler_kwargs = {}
-            
-            for param_name, param in sig.parameters.items():
-                if param_name == 'self':
-                    continue
-                elif param_name == 'chat_info':
-                    handler_kwargs['chat_info'] = chat_info
-                elif param_name == 'chat_item':
-                    handler_kwargs['chat_item'] = chat_item
-                elif param_name == 'bot':
-                    handler_kwargs['bot'] = self
-                elif param_name == 'client':
-                    handler_kwargs['client'] = self.client
-                elif param_name == 'profile':
-                    handler_kwargs['profile'] = self.profile_manager.current_profile
-                elif param_name in kwargs:
-                    handler_kwargs[param_name] = kwargs[param_name]
-                elif param.default is not inspect.Parameter.empty:
-                    # If the parameter has a default value, we don't need to provide it
-                    pass
-                elif param.kind == inspect.Parameter.VAR_KEYWORD:
-                    # If the handler accepts **kwargs, pass all remaining kwargs
-                    handler_kwargs.update(kwargs)
-            
-            await handler(**handler_kwargs)
-        except Exception as e:
-            traceback.print_exc()
-            print(f"Error in command handler: {e}")
+        handler, bind = entry
+        await handler(**bind(self, chat_info, chat_item, kwargs))
     
     async def get_user(self) -> UserWrapper:
         """Get the current active user."""
@@ -435,7 +847,9 @@ class SimpleXBot:
         Send a text message to a recipient.
         
         The recipient can be a ContactWrapper, GroupWrapper, ChatWrapper, ChatInfo,
-        or a tuple/dict with the necessary information.
+        a contact ID, or a (chat_type, chat_id) tuple as returned by chat_ref().
+        Handlers replying several times to the same chat can resolve the tuple
+        once with chat_ref() and reuse it.
         
         Args:
             recipient: The recipient to send the message to
@@ -453,14 +867,14 @@ class SimpleXBot:
         else:
             # Handle the original ChatInfo case and other potential formats
             contact_id = None
-            chat_type = ChatType.Direct
+            chat_type = _CT_DIRECT
             
-            if isinstance(recipient, dict):
-                if recipient.get("type") == "direct":
-                    contact_id = recipient.get("contact", {}).get("contactId")
-                elif recipient.get("type") == "group":
-                    chat_type = ChatType.Group
-                    contact_id = recipient.get("groupInfo", {}).get("groupId")
+            if isinstance(recipient, int):
+                contact_id = recipient
+            elif isinstance(recipient, tuple):
+                chat_type, contact_id = recipient
+            elif isinstance(recipient, dict):
+                chat_type, contact_id = self._chat_ref(recipient)
             
             if not contact_id:
                 raise ValueError("Cannot send message: invalid recipient format")
@@ -481,6 +895,19 @@ class SimpleXBot:
             prefix: The new command prefix
         """
         self._command_prefix = prefix
+        self._prefix_len = len(prefix)
+        self._invalidate_help_cache()
+    
+    def _set_help_text(self, name: str, help: str):
+        """Store a command's help text and keep the sorted command list current."""
+        self._help_command_text[name] = help
+        self._sorted_help_keys = tuple(sorted(self._help_command_text))
+        self._invalidate_help_cache()
+    
+    def _invalidate_help_cache(self):
+        """Drop the rendered help replies so they are rebuilt on next use."""
+        self._help_text_cache = None
+        self._help_detail_cache.clear()
     
     def set_welcome_message(self, message: str):
         """
@@ -491,12 +918,31 @@ class SimpleXBot:
         Args:
             message: The welcome message template
         """
-        self._welcome_message = message
+        self._set_welcome_template(message)
         
         # Update profile if available
         if self.profile_manager.current_profile:
             self.profile_manager.current_profile.welcome_message = message
     
+    def _set_welcome_template(self, message: str):
+        """
+        Store the welcome message and prepare its renderer.
+        
+        A message containing {name} renders as message.format(name=name),
+        so {{ and }} stand for literal braces; any other message is sent as is.
+        """
+        self._welcome_message = message
+        if "{name}" not in message:
+            self._welcome_render = lambda name: message
+            return
+        
+        segments = _name_template_segments(message)
+        if segments is not None:
+            # Static text around the placeholders, joined with the name
+            self._welcome_render = lambda name: name.join(segments)
+        else:
+            self._welcome_render = lambda name: message.format(name=name)
+    
     def set_profile(self, profile: BotProfile, name: str = "default"):
         """
         Set the bot profile.
@@ -509,9 +955,9 @@ class SimpleXBot:
         
         # Update bot configuration from profile
         if profile.welcome_message:
-            self._welcome_message = profile.welcome_message
+            self._set_welcome_template(profile.welcome_message)
         if profile.command_prefix:
-            self._command_prefix = profile.command_prefix
+            self.set_command_prefix(profile.command_prefix)
     
     async def switch_profile(self, name: str):
         """
@@ -524,13 +970,14 @@ class SimpleXBot:
         
         # Update bot configuration from profile
         if profile.welcome_message:
-            self._welcome_message = profile.welcome_message
+            self._set_welcome_template(profile.welcome_message)
         if profile.command_prefix:
-            self._command_prefix = profile.command_prefix
+            self.set_command_prefix(profile.command_prefix)
             
         # If bot is running, reconnect contacts
         if self.running:
-            # Re-register welcome message handler if one is set
+            # Register the welcome message handler if the new profile is the
+            # first to set a welcome message
             if self._welcome_message:
                 self._register_welcome_handler()
     
@@ -554,15 +1001,15 @@ class SimpleXBot:
     def on_contact_connected(self):
         """
         Decorator to register a custom handler for contact connections.
-        This replaces the default welcome message handler.
+        This replaces the default welcome message handler and any handler
+        previously registered with this decorator.
         
         Returns:
             A decorator function
         """
         def decorator(func):
-            if "contactConnected" in self._event_handlers:
-                self._event_handlers["contactConnected"] = []
-            return self.event("contactConnected")(func)
+            self._event_handlers[_CONTACT_CONNECTED] = ()
+            return self.event(_CONTACT_CONNECTED)(func)
         return decorator
     
     def event(self, event_type: str = None):
@@ -580,21 +1027,23 @@ class SimpleXBot:
             if event_type is None:
                 event_type = func.__name__
             
-            if event_type not in self._event_handlers:
-                self._event_handlers[event_type] = []
-            
-            self._event_handlers[event_type].append(func)
+            self._add_event_handler(event_type, func)
             return func
         
         return decorator
     
-    def command(self, name: str = None, *, pattern: str = None, help: str = None):
+    def _add_event_handler(self, event_type: str, handler: Callable):
+        """Append a handler to the handlers of an event type."""
+        self._event_handlers[event_type] = self._event_handlers.get(event_type, ()) + (handler,)
+    
+    def command(self, name: str = None, *, pattern: Union[str, Pattern] = None, help: str = None):
         """
         Decorator to register a command handler.
         
         Args:
             name: The name of the command
-            pattern: A regex pattern to match against the command text
+            pattern: A regex pattern, as a string or already compiled, to match
+                against the command text
             help: Help text for the command
             
         Returns:
@@ -604,15 +1053,26 @@ class SimpleXBot:
             nonlocal name
             if name is None:
                 name = func.__name__
+            # Commands are matched case-insensitively
+            name = name.lower()
             
+            entry = (func, _make_binder(*_binding_plan(func)))
             if pattern:
-                compiled_pattern = re.compile(pattern)
-                self._command_handlers[compiled_pattern] = func
+                compiled_pattern = _compile_pattern(pattern) if isinstance(pattern, str) else pattern
+                # Registering the same pattern again replaces its handler
+                for i, (existing, _) in enumerate(self._pattern_handlers):
+                    if existing == compiled_pattern:
+                        self._pattern_handlers[i] = (compiled_pattern, entry)
+                        break
+                else:
+                    self._pattern_handlers.append((compiled_pattern, entry))
+                self._combined_stale = True
+                self._dispatch_cache.clear()
             else:
-                self._command_handlers[name] = func
+                self._exact_handlers[name] = entry
             
             if help:
-                self._help_command_text[name] = help
+                self._set_help_text(name, help)
             
             return func
         
@@ -1,46 +1,162 @@
 import asyncio
+import contextlib
+import copy
+import functools
+import inspect
 import json
+import logging
+import sys
+from collections import OrderedDict
 from enum import Enum
 from typing import Dict, List, Any, Optional, Tuple, Union, Callable, TypeVar, Generic, cast
 
 from .queuex import ABQueue
 from .transport import (
-    ChatTransport, ChatServer, ChatSrvRequest, ChatSrvResponse, 
-    ChatResponseError, local_server, noop
+    ChatTransport, ChatServer, ChatSrvRequest, 
+    ChatResponseError, local_server, noop, _wait_with_timeout
 )
 from .command import (
-    ChatCommand, ChatType, Profile, cmd_string, MsgContent,
-    GroupMemberRole, ComposedMessage, DeleteMode, ChatItemId, GroupProfile
+    ChatCommand, ChatType, Profile, cmd_string, send_message_cmd, send_json_cmd, send_text_cmd, chat_items_read_cmd, MsgContent,
+    GroupMemberRole, ComposedMessage, DeleteMode, ChatItemId, GroupProfile, _dumps
 )
 from .response import (
     ChatResponse, ChatInfo, User, Contact, GroupInfo, GroupMember,
     AChatItem, ChatItem, ConnectionStats, CRChatCmdError, Chat
 )
 
+logger = logging.getLogger(__name__)
+
+# Wire values of the chat types
+_CT_VAL = {ct: ct.value for ct in ChatType}
+
+# Commands without parameters, serialized once at import
+_CMD_SHOW_ACTIVE_USER = cmd_string({"type": "showActiveUser"})
+_CMD_START_CHAT = cmd_string({"type": "startChat"})
+_CMD_STOP_CHAT = cmd_string({"type": "apiStopChat"})
+_CMD_DISABLE_AUTO_ACCEPT = cmd_string({"type": "addressAutoAccept"})
+_CMD_ADD_CONTACT = cmd_string({"type": "addContact"})
+_CMD_CREATE_MY_ADDRESS = cmd_string({"type": "createMyAddress"})
+_CMD_DELETE_MY_ADDRESS = cmd_string({"type": "deleteMyAddress"})
+_CMD_SHOW_MY_ADDRESS = cmd_string({"type": "showMyAddress"})
+
+# Commands that only read state and leave the read cache valid
+_READ_COMMANDS = frozenset((
+    "showActiveUser", "listUsers", "apiGetChats", "apiGetChat",
+    "apiContactInfo", "apiGroupMemberInfo", "apiListMembers", "showMyAddress",
+))
+
+# Commands that change the list of chats or the contacts and groups in it
+_CHAT_LIST_COMMANDS = frozenset((
+    "connect", "apiDeleteChat", "apiClearChat", "apiSetContactAlias",
+    "apiAcceptContact", "apiRejectContact", "newGroup", "apiAddMember",
+    "apiJoinGroup", "apiRemoveMember", "apiLeaveGroup", "apiUpdateGroupProfile",
+))
+
+# Prebuilt commands that only read state
+_READ_CMD_STRINGS = frozenset((_CMD_SHOW_ACTIVE_USER, _CMD_SHOW_MY_ADDRESS))
+
+# Maximum number of cached read results
+_READ_CACHE_SIZE = 1000
+
+# How long item IDs passed to api_chat_read are collected before being sent, in seconds
+_READ_BATCH_DELAY = 0.005
+
+# Maximum number of send commands a broadcast has in flight at once
+_BROADCAST_CONCURRENCY = 64
+
+def _cached_read(method):
+    """
+    Cache the result of a read-only API method until the next state change.
+    
+    The cache is cleared whenever a command that may change state is sent and
+    whenever the server pushes an event. Each caller gets a shallow copy of
+    the cached result.
+    """
+    name = method.__name__
+    # Parameters after self, used to key keyword calls like positional ones
+    params = list(inspect.signature(method).parameters.values())[1:]
+    param_names = [param.name for param in params]
+    defaults = [param.default for param in params]
+    
+    @functools.wraps(method)
+    async def wrapper(self, *args, **kwargs):
+        if kwargs or len(args) < len(params):
+            n = len(args)
+            values = [kwargs.get(param, default) for param, default in zip(param_names[n:], defaults[n:])]
+            if (len(args) > len(params) or inspect.Parameter.empty in values or
+                    len(kwargs) != sum(param in kwargs for param in param_names[n:])):
+                # Not a valid call; let the method raise the usual TypeError
+                return await method(self, *args, **kwargs)
+            args = (*args, *values)
+        key = (name, args)
+        cache = self._read_cache
+        if key in cache:
+            cache.move_to_end(key)
+            return copy.copy(cache[key])
+        
+        generation = self._read_generation
+        result = await method(self, *args)
+        # Don't store a result that may predate a change made meanwhile
+        if generation == self._read_generation:
+            cache[key] = result
+            if len(cache) > _READ_CACHE_SIZE:
+                cache.popitem(last=False)
+            return copy.copy(result)
+        return result
+    return wrapper
+
+@functools.lru_cache(maxsize=512)
+def _cached_cmd_string(items: Tuple[Tuple[str, type, Any], ...]) -> str:
+    """
+    Serialize a command given as a tuple of its (key, value type, value) items,
+    caching the result. The types keep equal values such as True and 1 apart.
+    """
+    return cmd_string({k: v for k, _, v in items})
+
 class ConnReqType(str, Enum):
     """Connection request types."""
     Invitation = "invitation"
     Contact = "contact"
 
+# Connection request type by the response type of the connect command
+_CONNECT_RESULTS = {
+    "sentConfirmation": ConnReqType.Invitation,
+    "sentInvitation": ConnReqType.Contact,
+}
+
+# Response type that confirms apiDeleteChat, by chat type
+_DELETE_CHAT_OK = {
+    ChatType.Direct: "contactDeleted",
+    ChatType.Group: "groupDeletedUser",
+    ChatType.ContactRequest: "contactConnectionDeleted",
+}
+
+# Response types that confirm startChat
+_START_CHAT_OK = frozenset(("chatStarted", "chatRunning"))
+
 class ChatClientConfig:
     """Configuration for the chat client."""
     
-    def __init__(self, q_size: int, tcp_timeout: float):
-        self.q_size = q_size
-        self.tcp_timeout = tcp_timeout
-
-class Request:
-    """A request with promise-like resolution methods."""
+    __slots__ = ("q_size", "tcp_timeout", "resp_timeout", "event_q_size")
     
     def __init__(self, 
-                 resolve: Callable[[ChatResponse], None], 
-                 reject: Callable[[Optional[Union[ChatResponseError, Any]]], None]):
-        self.resolve = resolve
-        self.reject = reject
+                 q_size: int, 
+                 tcp_timeout: float, 
+                 resp_timeout: float = 60000, 
+                 event_q_size: Optional[int] = None):
+        self.q_size = q_size
+        self.tcp_timeout = tcp_timeout
+        # How long to wait for the response to a command, in milliseconds
+        self.resp_timeout = resp_timeout
+        # Maximum number of server events waiting to be handled, or None for
+        # no limit. Events that arrive while the queue is full are dropped.
+        self.event_q_size = event_q_size
 
 class ChatCommandError(Exception):
     """Error in chat command execution."""
     
+    __slots__ = ("message", "response")
+    
     def __init__(self, message: str, response: ChatResponse):
         super().__init__(message)
         self.message = message
@@ -49,7 +165,7 @@ class ChatCommandError(Exception):
 class ChatClient:
     """Client for chat service communication."""
     
-    default_config = ChatClientConfig(q_size=16, tcp_timeout=4000)
+    default_config = ChatClientConfig(q_size=32, tcp_timeout=4000)
     
     def __init__(self, 
                  server: Union[ChatServer, str], 
@@ -59,12 +175,27 @@ class ChatClient:
                  transport: ChatTransport):
         self._connected = True
         self.client_corr_id = 0
-        self.sent_commands: Dict[str, Request] = {}
+        # Server events dropped because the message queue was full, see ChatClientConfig.event_q_size
+        self.dropped_events = 0
+        # Incremented whenever a command sent by this client may change the chat list
+        self.chats_generation = 0
+        # Results of read-only API calls, see _cached_read
+        self._read_cache: OrderedDict = OrderedDict()
+        self._read_generation = 0
+        # Item IDs waiting to be marked as read, with the future shared by their callers
+        self._read_pending: Dict[Tuple[ChatType, int], Tuple[List[int], asyncio.Future]] = {}
+        self._read_flush: Optional[asyncio.TimerHandle] = None
+        self._read_tasks: set = set()
+        # Pending requests by correlation ID, which is only a string on the wire
+        self.sent_commands: Dict[int, asyncio.Future] = {}
         self.server = server
         self.config = config
         self.msg_q = msg_q
         self.client = client_task
         self.transport = transport
+        # (corr_id, request) pairs waiting to be written, in order, by the writer task
+        self._out_q: asyncio.Queue = asyncio.Queue()
+        self._writer: Optional[asyncio.Task] = None
     
     @classmethod
     async def create(cls, 
@@ -77,7 +208,9 @@ class ChatClient:
             cfg = cls.default_config
         
         transport = await ChatTransport.connect(server, cfg.tcp_timeout / 1000, cfg.q_size)
-        msg_q = ABQueue[ChatResponse](cfg.q_size)
+        # Events are only dropped if the configuration limits their number
+        event_q_size = sys.maxsize if cfg.event_q_size is None else cfg.event_q_size
+        msg_q = ABQueue[ChatResponse](event_q_size)
         
         # Create instance first so we can reference it in the task
         client = cls(server, cfg, msg_q, None, transport)
@@ -85,77 +218,151 @@ class ChatClient:
         # Create and start the client task
         client_task = asyncio.create_task(cls._run_client(client, transport))
         client.client = client_task
+        client._writer = asyncio.create_task(client._writer_loop())
         
         return client
     
     @staticmethod
     async def _run_client(client: 'ChatClient', transport: ChatTransport) -> None:
         """Background task to process incoming messages."""
+        sent_commands = client.sent_commands
+        try_enqueue = client.msg_q.try_enqueue
         try:
-            async for item in transport:
-                if isinstance(item, ChatResponseError):
-                    print("Chat response error: ", item)
-                else:
-                    api_resp = item
-                    corr_id = api_resp.corr_id
-                    resp = api_resp.resp
-                    
-                    if corr_id:
-                        req = client.sent_commands.get(corr_id)
-                        if req:
-                            del client.sent_commands[corr_id]
-                            req.resolve(resp)
-                        else:
-                            # TODO: send error to errQ?
-                            print("No command sent for chat response: ", api_resp)
+            async for is_error, corr_id, resp in transport:
+                if is_error:
+                    logger.warning("Chat response error: %s", resp)
+                elif corr_id:
+                    try:
+                        future = sent_commands.pop(int(corr_id), None)
+                    except ValueError:
+                        future = None
+                    if future is not None:
+                        if not future.done():
+                            future.set_result(resp)
                     else:
-                        await client.msg_q.enqueue(resp)
-        except Exception as e:
-            print(f"Client error: {e}")
+                        # TODO: send error to errQ?
+                        if logger.isEnabledFor(logging.DEBUG):
+                            logger.debug("No command sent for chat response: %s %r", corr_id, resp)
+                else:
+                    # Any server event may change what the read APIs return
+                    client._invalidate_reads()
+                    if try_enqueue(resp):
+                        continue
+                    # Never wait for room here: that would also hold up the
+                    # responses to commands that the consumer may be awaiting
+                    client.dropped_events += 1
+                    logger.warning("Message queue full, dropped %s event", resp.get('type'))
+        except Exception:
+            logger.exception("Client error")
         finally:
             client._connected = False
+            # No more responses will arrive, so fail all pending commands
+            for future in client.sent_commands.values():
+                if not future.done():
+                    future.set_exception(ConnectionError("Chat transport closed"))
+            client.sent_commands.clear()
+    
+    async def _writer_loop(self) -> None:
+        """Background task to write queued requests to the transport."""
+        out_q = self._out_q
+        write = self.transport.write
+        while True:
+            corr_id, t = await out_q.get()
+            try:
+                await write(t)
+            except Exception as e:
+                # The response will never come, so fail the waiting request
+                future = self.sent_commands.pop(corr_id, None)
+                if future is not None and not future.done():
+                    future.set_exception(e)
     
     async def send_chat_cmd_str(self, cmd: str) -> ChatResponse:
-        """Send a chat command as a string."""
-        self.client_corr_id += 1
-        corr_id = str(self.client_corr_id)
-        t = ChatSrvRequest(corr_id, cmd)
-        
-        # Create future for the response
-        future = asyncio.Future()
+        """
+        Send a chat command as a string.
         
-        def resolve(resp):
-            if not future.done():
-                future.set_result(resp)
-        
-        def reject(err=None):
-            if not future.done():
-                future.set_exception(err if err else Exception("Unknown error"))
+        Except for the prebuilt read-only commands, the command is assumed
+        to change state, including the chat list, so cached read results are
+        dropped.
+        """
+        read_only = cmd in _READ_CMD_STRINGS
+        if not read_only:
+            self.chats_generation += 1
+        return await self._send_cmd_str(cmd, read_only)
+    
+    async def _send_cmd_str(self, cmd: str, read_only: bool) -> ChatResponse:
+        """Send a serialized command, clearing the read cache unless it is read_only."""
+        # Nothing would write the request, so don't wait out the response timeout
+        if not self._connected:
+            raise ConnectionError("Chat client disconnected")
+        if not read_only:
+            self._invalidate_reads()
+        self.client_corr_id += 1
+        corr_id = self.client_corr_id
+        t = ChatSrvRequest(str(corr_id), cmd)
         
-        self.sent_commands[corr_id] = Request(resolve, reject)
+        # Create future for the response, resolved by _run_client
+        future = asyncio.get_running_loop().create_future()
+        self.sent_commands[corr_id] = future
         
-        # Fire and forget the write operation
-        asyncio.create_task(self.transport.write(t))
+        # Hand the request to the writer task
+        self._out_q.put_nowait((corr_id, t))
         
         # Wait for the response
-        return await future
+        try:
+            return await _wait_with_timeout(future, self.config.resp_timeout / 1000)
+        finally:
+            self.sent_commands.pop(corr_id, None)
+    
+    def _invalidate_reads(self) -> None:
+        """Drop cached read results after a possible state change."""
+        self._read_generation += 1
+        if self._read_cache:
+            self._read_cache.clear()
     
     async def send_chat_command(self, command: ChatCommand) -> ChatResponse:
         """Send a chat command."""
-        return await self.send_chat_cmd_str(cmd_string(command))
+        try:
+            # Commands with only hashable values are serialized once per shape
+            cmd = _cached_cmd_string(tuple([(k, type(v), v) for k, v in command.items()]))
+        except TypeError:
+            cmd = cmd_string(command)
+        t = command["type"]
+        if t in _CHAT_LIST_COMMANDS:
+            self.chats_generation += 1
+        return await self._send_cmd_str(cmd, t in _READ_COMMANDS)
     
     async def disconnect(self) -> None:
         """Disconnect from the chat server."""
+        self._connected = False
         await self.transport.close()
+        if self._read_flush:
+            self._read_flush.cancel()
+            self._read_flush = None
+        for _, future in self._read_pending.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Chat client disconnected"))
+        self._read_pending.clear()
+        for task in list(self._read_tasks):
+            task.cancel()
+        if self._writer:
+            self._writer.cancel()
+        # Cancelled rather than awaited, as the task may be waiting on the transport
         if self.client and not self.client.done():
-            await self.client
+            self.client.cancel()
+            with contextlib.suppress(asyncio.CancelledError):
+                await self.client
+        for future in self.sent_commands.values():
+            if not future.done():
+                future.set_exception(ConnectionError("Chat client disconnected"))
+        self.sent_commands.clear()
     
     async def api_get_active_user(self) -> Optional[User]:
         """Get the active user."""
-        r = await self.send_chat_command({"type": "showActiveUser"})
-        if r["type"] == "activeUser":
+        r = await self.send_chat_cmd_str(_CMD_SHOW_ACTIVE_USER)
+        t = r["type"]
+        if t == "activeUser":
             return r["user"]
-        elif r["type"] == "chatCmdError":
+        elif t == "chatCmdError":
             if (r["chatError"]["type"] == "error" and 
                 r["chatError"]["errorType"]["type"] == "noActiveUser"):
                 return None
@@ -180,13 +387,13 @@ class ChatClient:
     
     async def api_start_chat(self) -> None:
         """Start the chat."""
-        r = await self.send_chat_command({"type": "startChat"})
-        if r["type"] not in ["chatStarted", "chatRunning"]:
+        r = await self.send_chat_cmd_str(_CMD_START_CHAT)
+        if r["type"] not in _START_CHAT_OK:
             raise ChatCommandError("Error starting chat", r)
     
     async def api_stop_chat(self) -> None:
         """Stop the chat."""
-        r = await self.send_chat_command({"type": "apiStopChat"})
+        r = await self.send_chat_cmd_str(_CMD_STOP_CHAT)
         if r["type"] != "chatStopped":
             raise ChatCommandError("Error stopping chat", r)
     
@@ -210,10 +417,11 @@ class ChatClient:
     
     async def disable_address_auto_accept(self) -> None:
         """Disable auto-accept for contact requests."""
-        r = await self.send_chat_command({"type": "addressAutoAccept"})
+        r = await self.send_chat_cmd_str(_CMD_DISABLE_AUTO_ACCEPT)
         if r["type"] != "userContactLinkUpdated":
             raise ChatCommandError("Error changing user contact address mode", r)
     
+    @_cached_read
     async def api_get_chats(self, user_id: int) -> List[Chat]:
         """Get chats for a user."""
         r = await self.send_chat_command({"type": "apiGetChats", "userId": user_id})
@@ -232,7 +440,7 @@ class ChatClient:
         
         r = await self.send_chat_command({
             "type": "apiGetChat", 
-            "chatType": chat_type.value, 
+            "chatType": _CT_VAL[chat_type], 
             "chatId": chat_id, 
             "pagination": pagination, 
             "search": search
@@ -247,17 +455,40 @@ class ChatClient:
                               messages: List[ComposedMessage],
                               is_live: bool = False) -> List[AChatItem]:
         """Send messages to a chat."""
-        r = await self.send_chat_command({
-            "type": "apiSendMessage", 
-            "chatType": chat_type.value,  # Use the enum value
-            "chatId": chat_id, 
-            "liveMessage": is_live,
-            "messages": messages
-        })
+        r = await self._send_cmd_str(send_message_cmd(_CT_VAL[chat_type], chat_id, messages, is_live), False)
         if r["type"] == "newChatItems":
             return r["chatItems"]
         raise ChatCommandError("Unexpected response", r)
     
+    async def api_broadcast_messages(self, 
+                                     chats: List[Tuple[ChatType, int]], 
+                                     messages: List[ComposedMessage]) -> List[Union[List[AChatItem], Exception]]:
+        """
+        Send the same messages to several chats.
+        
+        The server takes one chat per send command, so the messages are
+        serialized once and the per-chat commands are sent concurrently.
+        
+        Args:
+            chats: The (chat_type, chat_id) of each chat to send to
+            messages: The messages to send
+            
+        Returns:
+            For each chat, in order, its new chat items or the exception
+            raised while sending to it
+        """
+        messages_json = _dumps(messages)
+        semaphore = asyncio.Semaphore(_BROADCAST_CONCURRENCY)
+        
+        async def send(chat_type: ChatType, chat_id: int) -> List[AChatItem]:
+            async with semaphore:
+                r = await self._send_cmd_str(send_json_cmd(_CT_VAL[chat_type], chat_id, messages_json), False)
+            if r["type"] == "newChatItems":
+                return r["chatItems"]
+            raise ChatCommandError("Unexpected response", r)
+        
+        return await asyncio.gather(*(send(chat_type, chat_id) for chat_type, chat_id in chats), return_exceptions=True)
+    
     async def api_send_text_message(self, 
                                   chat_type: ChatType, 
                                   chat_id: int, 
@@ -275,20 +506,17 @@ class ChatClient:
                 },
                 "ttl": ttl
             }
-        else:
-            # Build a standard text message
-            message = {
-                "msgContent": {
-                    "type": "text",
-                    "text": text
-                }
-            }
-        return await self.api_send_messages(
-            chat_type, 
-            chat_id, 
-            [message],
-            is_live=live
-        )
+            return await self.api_send_messages(
+                chat_type, 
+                chat_id, 
+                [message],
+                is_live=live
+            )
+        # Standard text messages skip building the message dict
+        r = await self._send_cmd_str(send_text_cmd(_CT_VAL[chat_type], chat_id, text), False)
+        if r["type"] == "newChatItems":
+            return r["chatItems"]
+        raise ChatCommandError("Unexpected response", r)
     
     async def api_update_chat_item(self, 
                                  chat_type: ChatType, 
@@ -299,7 +527,7 @@ class ChatClient:
         is_live = msg_content.get("type") == "liveText"
         r = await self.send_chat_command({
             "type": "apiUpdateChatItem", 
-            "chatType": chat_type.value, 
+            "chatType": _CT_VAL[chat_type], 
             "chatId": chat_id, 
             "chatItemId": chat_item_id, 
             "msgContent": msg_content,
@@ -317,7 +545,7 @@ class ChatClient:
         """Delete a chat item."""
         r = await self.send_chat_command({
             "type": "apiDeleteChatItem", 
-            "chatType": chat_type.value, 
+            "chatType": _CT_VAL[chat_type], 
             "chatId": chat_id, 
             "chatItemId": chat_item_id, 
             "deleteMode": delete_mode.value
@@ -328,7 +556,7 @@ class ChatClient:
     
     async def api_create_link(self) -> str:
         """Create a connection request link."""
-        r = await self.send_chat_command({"type": "addContact"})
+        r = await self.send_chat_cmd_str(_CMD_ADD_CONTACT)
         if r["type"] == "invitation":
             return r["connReqInvitation"]
         raise ChatCommandError("Error creating link", r)
@@ -336,26 +564,20 @@ class ChatClient:
     async def api_connect(self, conn_req: str) -> ConnReqType:
         """Connect using a connection request."""
         r = await self.send_chat_command({"type": "connect", "connReq": conn_req})
-        if r["type"] == "sentConfirmation":
-            return ConnReqType.Invitation
-        elif r["type"] == "sentInvitation":
-            return ConnReqType.Contact
-        else:
-            raise ChatCommandError("Connection error", r)
+        conn_req_type = _CONNECT_RESULTS.get(r["type"])
+        if conn_req_type is not None:
+            return conn_req_type
+        raise ChatCommandError("Connection error", r)
     
     async def api_delete_chat(self, chat_type: ChatType, chat_id: int) -> None:
         """Delete a chat."""
         r = await self.send_chat_command({
             "type": "apiDeleteChat", 
-            "chatType": chat_type.value, 
+            "chatType": _CT_VAL[chat_type], 
             "chatId": chat_id
         })
         
-        if chat_type == ChatType.Direct and r["type"] == "contactDeleted":
-            return
-        elif chat_type == ChatType.Group and r["type"] == "groupDeletedUser":
-            return
-        elif chat_type == ChatType.ContactRequest and r["type"] == "contactConnectionDeleted":
+        if r["type"] == _DELETE_CHAT_OK.get(chat_type):
             return
         
         raise ChatCommandError("Error deleting chat", r)
@@ -364,7 +586,7 @@ class ChatClient:
         """Clear a chat's history."""
         r = await self.send_chat_command({
             "type": "apiClearChat", 
-            "chatType": chat_type.value, 
+            "chatType": _CT_VAL[chat_type], 
             "chatId": chat_id
         })
         if r["type"] == "chatCleared":
@@ -378,9 +600,10 @@ class ChatClient:
             "userId": user_id, 
             "profile": profile
         })
-        if r["type"] == "userProfileNoChange":
+        t = r["type"]
+        if t == "userProfileNoChange":
             return None
-        elif r["type"] == "userProfileUpdated":
+        elif t == "userProfileUpdated":
             return r["toProfile"]
         else:
             raise ChatCommandError("Error updating profile", r)
@@ -398,27 +621,29 @@ class ChatClient:
     
     async def api_create_user_address(self) -> str:
         """Create a user contact address."""
-        r = await self.send_chat_command({"type": "createMyAddress"})
+        r = await self.send_chat_cmd_str(_CMD_CREATE_MY_ADDRESS)
         if r["type"] == "userContactLinkCreated":
             return r["connReqContact"]
         raise ChatCommandError("Error creating user address", r)
     
     async def api_delete_user_address(self) -> None:
         """Delete a user contact address."""
-        r = await self.send_chat_command({"type": "deleteMyAddress"})
+        r = await self.send_chat_cmd_str(_CMD_DELETE_MY_ADDRESS)
         if r["type"] == "userContactLinkDeleted":
             return
         raise ChatCommandError("Error deleting user address", r)
     
+    @_cached_read
     async def api_get_user_address(self) -> Optional[str]:
         """Get the user's contact address."""
-        r = await self.send_chat_command({"type": "showMyAddress"})
-        if r["type"] == "userContactLink":
+        r = await self.send_chat_cmd_str(_CMD_SHOW_MY_ADDRESS)
+        t = r["type"]
+        if t == "userContactLink":
             link = r["contactLink"]
             if "connLinkContact" in link:
                 return link["connLinkContact"]["connFullLink"]
-            return r["contactLink"]["connReqContact"]
-        elif (r["type"] == "chatCmdError" and 
+            return link["connReqContact"]
+        elif (t == "chatCmdError" and 
               r["chatError"]["type"] == "errorStore" and 
               r["chatError"]["storeError"]["type"] == "userContactLinkNotFound"):
             return None
@@ -449,21 +674,65 @@ class ChatClient:
                           chat_type: ChatType, 
                           chat_id: int, 
                             ids: Union[int,List[int]]) -> None:
-        """Mark chat items as read."""
+        """
+        Mark chat items as read.
+        
+        Item IDs from calls made within a few milliseconds of each other are
+        sent together, as one command per chat.
+        """
         if ids:
-            return await self.ok_chat_command({
-                "type": "apiChatItemsRead", 
-                "chatType": chat_type.value, 
-                "chatId": chat_id, 
-                "msgIds": ids
-            })
+            key = (chat_type, chat_id)
+            batch = self._read_pending.get(key)
+            if batch is None:
+                batch = self._read_pending[key] = ([], asyncio.get_running_loop().create_future())
+            if isinstance(ids, int):
+                batch[0].append(ids)
+            else:
+                batch[0].extend(ids)
+            if self._read_flush is None:
+                self._read_flush = asyncio.get_running_loop().call_later(_READ_BATCH_DELAY, self._flush_reads)
+            # Shielded so that one cancelled caller doesn't fail the whole batch
+            await asyncio.shield(batch[1])
         else:
             return await self.ok_chat_command({
                 "type": "apiChatRead", 
-                "chatType": chat_type.value, 
+                "chatType": _CT_VAL[chat_type], 
                 "chatId": chat_id, 
             })
     
+    def _flush_reads(self) -> None:
+        """Send the pending item IDs of each chat as one apiChatItemsRead command."""
+        self._read_flush = None
+        pending, self._read_pending = self._read_pending, {}
+        for (chat_type, chat_id), (ids, future) in pending.items():
+            task = asyncio.create_task(self._send_chat_items_read(chat_type, chat_id, ids, future))
+            self._read_tasks.add(task)
+            task.add_done_callback(self._read_tasks.discard)
+    
+    async def _send_chat_items_read(self, 
+                                    chat_type: ChatType, 
+                                    chat_id: int, 
+                                    ids: List[int], 
+                                    future: asyncio.Future) -> None:
+        """Mark a batch of chat items as read and resolve the future shared by its callers."""
+        try:
+            # Deduplicated, keeping the order in which the IDs were added
+            r = await self._send_cmd_str(chat_items_read_cmd(_CT_VAL[chat_type], chat_id, list(dict.fromkeys(ids))), False)
+            if r["type"] != "cmdOk":
+                raise ChatCommandError("apiChatItemsRead command error", r)
+        except asyncio.CancelledError:
+            # Cancelled by disconnect(), so the batch was never confirmed
+            if not future.done():
+                future.set_exception(ConnectionError("Chat client disconnected"))
+            raise
+        except Exception as e:
+            if not future.done():
+                future.set_exception(e)
+        else:
+            if not future.done():
+                future.set_result(None)
+    
+    @_cached_read
     async def api_contact_info(self, contact_id: int) -> Tuple[Optional[ConnectionStats], Optional[Profile]]:
         """Get information about a contact."""
         r = await self.send_chat_command({
@@ -474,6 +743,7 @@ class ChatClient:
             return r.get("connectionStats"), r.get("customUserProfile")
         raise ChatCommandError("Error getting contact info", r)
     
+    @_cached_read
     async def api_group_member_info(self, group_id: int, member_id: int) -> Optional[ConnectionStats]:
         """Get information about a group member."""
         r = await self.send_chat_command({
@@ -551,6 +821,7 @@ class ChatClient:
             return r["groupInfo"]
         raise ChatCommandError("Error leaving group", r)
     
+    @_cached_read
     async def api_list_members(self, group_id: int) -> List[GroupMember]:
         """List members of a group."""
         r = await self.send_chat_command({
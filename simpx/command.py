@@ -1,7 +1,27 @@
+import json
 from enum import Enum, auto
-from typing import Union, Optional, List, Dict, Any, Literal, TypedDict, overload
+from typing import Union, Optional, List, Dict, Any, Callable, Final, Literal, Mapping, TypedDict, overload
 from dataclasses import dataclass, field
 
+# orjson is used for command payloads and the protocol envelope when it is
+# installed. These are the package's only JSON helpers; transport.py imports them.
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+if orjson is not None:
+    _loads = orjson.loads
+    
+    def _dumps(obj: Any) -> str:
+        """Serialize obj to a JSON string."""
+        # Decoded so that requests are still sent as text frames
+        return orjson.dumps(obj).decode()
+else:
+    _loads = json.loads
+    # Bound once, as every command carrying a payload serializes it
+    _dumps = json.dumps
+
 class ChatType(str, Enum):
     """Types of chats."""
     Direct = "@"
@@ -346,8 +366,16 @@ def maybe(value: Optional[Any]) -> str:
 
 def maybe_json(value: Optional[Any]) -> str:
     """Format optional value as JSON string with leading space if present."""
-    import json
-    return f' json {json.dumps(value)}' if value is not None else ""
+    return f' json {_dumps(value)}' if value is not None else ""
+
+def wire(value: Any) -> Any:
+    """Return the value of an enum member, or value itself if it isn't one."""
+    # f-strings format str enums as "ChatType.Direct" rather than by value
+    return value.value if isinstance(value, Enum) else value
+
+# on_off values, inlined where a missing flag means off
+_ON = "on"
+_OFF = "off"
 
 def on_off(value: Optional[bool], default: bool = True) -> str:
     """Convert boolean to 'on' or 'off' string."""
@@ -358,82 +386,196 @@ def on_off(value: Optional[bool], default: bool = True) -> str:
 def pagination_str(cp: ChatPagination) -> str:
     """Format pagination parameters as string."""
     if 'after' in cp:
-        base = f" after={cp['after']}"
+        return "".join((" after=", str(cp['after']), " count=", str(cp['count'])))
     elif 'before' in cp:
-        base = f" before={cp['before']}"
-    else:
-        base = ""
-    return f"{base} count={cp['count']}"
+        return "".join((" before=", str(cp['before']), " count=", str(cp['count'])))
+    return f" count={cp['count']}"
 
 def auto_accept_str(auto_accept: Optional[AutoAccept]) -> str:
     """Format auto-accept settings as string."""
     if not auto_accept:
         return "off"
     
-    import json
     msg = auto_accept.get("autoReply")
-    result = "on"
+    parts = ["on"]
     
     if auto_accept.get("acceptIncognito"):
-        result += " incognito=on"
+        parts.append(" incognito=on")
     
     if msg:
-        result += f" json {json.dumps(msg)}"
+        parts.append(" json ")
+        parts.append(_dumps(msg))
     
-    return result
+    return "".join(parts)
 
 def wrappify(d):
     if 'msgContent' in d:
         return {'msgContent':d['msgContent'], 'mentions':{}}
 
+# Builders for frequently sent commands that take the fields positionally, so
+# callers can skip building a command dict. chat_type is the ChatType value.
+def send_message_cmd(chat_type: str, chat_id: int, messages: List[ComposedMessage], live: bool = False) -> str:
+    """Build the apiSendMessage command string."""
+    return send_json_cmd(chat_type, chat_id, _dumps(messages), live)
+
+def send_json_cmd(chat_type: str, chat_id: int, messages_json: str, live: bool = False) -> str:
+    """Build the apiSendMessage command string from messages already serialized to JSON."""
+    return f"/_send {chat_type}{chat_id}{' live=on' if live else ''} json {messages_json}"
+
+# The JSON around the text of a single text message, as _dumps formats it
+_TEXT_MSG_START, _TEXT_MSG_END = _dumps([{"msgContent": {"type": "text", "text": ""}}]).split('""')
+
+def send_text_cmd(chat_type: str, chat_id: int, text: str) -> str:
+    """Build the apiSendMessage command string for a single text message."""
+    # Same output as send_message_cmd for [{"msgContent": {"type": "text", "text": text}}]
+    return f"/_send {chat_type}{chat_id} json {_TEXT_MSG_START}{_dumps(text)}{_TEXT_MSG_END}"
+
+def chat_items_read_cmd(chat_type: str, chat_id: int, msg_ids: Union[int, List[int]]) -> str:
+    """Build the apiChatItemsRead command string."""
+    # A single ID may be given on its own
+    if isinstance(msg_ids, int):
+        return f"/_read chat items {chat_type}{chat_id} {msg_ids}"
+    return f"/_read chat items {chat_type}{chat_id} {' '.join(map(str, msg_ids))}"
+
+# Strings of the commands that take no parameters
+_CONST_CMDS: Final[Mapping[str, str]] = {
+    "showActiveUser": "/u",
+    "listUsers": "/users",
+    "apiStopChat": "/_stop",
+    "addContact": "/connect",
+    "createMyAddress": "/address",
+    "deleteMyAddress": "/delete_address",
+    "showMyAddress": "/show_address",
+}
+
+# Command string builders, one per command type with parameters
+def _b_create_active_user(c: Dict[str, Any]) -> str:
+    return f"/_create user {_dumps({'profile': c.get('profile'), 'sameServers': c['sameServers'], 'pastTimestamp': c['pastTimestamp']})}"
+
+def _b_start_chat(c: Dict[str, Any]) -> str:
+    return f"/_start subscribe={_ON if c.get('subscribeConnections') else _OFF} expire={_ON if c.get('enableExpireChatItems') else _OFF}"
+
+def _b_set_incognito(c: Dict[str, Any]) -> str:
+    return f"/incognito {on_off(c['incognito'])}"
+
+def _b_api_get_chats(c: Dict[str, Any]) -> str:
+    return f"/_get chats pcc={_ON if c.get('pendingConnections') else _OFF}"
+
+def _b_api_get_chat(c: Dict[str, Any]) -> str:
+    return f"/_get chat {wire(c['chatType'])}{c['chatId']}{pagination_str(c['pagination'])}{' ' + c['search'] if c.get('search') else ''}"
+
+def _b_api_send_message(c: Dict[str, Any]) -> str:
+    return send_message_cmd(wire(c['chatType']), c['chatId'], c['messages'], c.get("liveMessage"))
+
+def _b_api_update_chat_item(c: Dict[str, Any]) -> str:
+    return f"/_update item {wire(c['chatType'])}{c['chatId']} {c['chatItemId']}{' live=on' if c.get('liveMessage') else ''} json {_dumps(wrappify(c))}"
+
+def _b_api_delete_chat_item(c: Dict[str, Any]) -> str:
+    return f"/_delete item {wire(c['chatType'])}{c['chatId']} {c['chatItemId']} {wire(c['deleteMode'])}"
+
+def _b_api_chat_read(c: Dict[str, Any]) -> str:
+    item_range = c.get('itemRange')
+    if item_range:
+        return f"/_read chat {wire(c['chatType'])}{c['chatId']} from={item_range['fromItem']} to={item_range['toItem']}"
+    return f"/_read chat {wire(c['chatType'])}{c['chatId']}"
+
+def _b_api_chat_items_read(c: Dict[str, Any]) -> str:
+    return chat_items_read_cmd(wire(c['chatType']), c['chatId'], c['msgIds'])
+
+def _b_api_delete_chat(c: Dict[str, Any]) -> str:
+    return f"/_delete {wire(c['chatType'])}{c['chatId']}"
+
+def _b_api_clear_chat(c: Dict[str, Any]) -> str:
+    return f"/_clear chat {wire(c['chatType'])}{c['chatId']}"
+
+def _b_api_accept_contact(c: Dict[str, Any]) -> str:
+    return f"/_accept {c['contactReqId']}"
+
+def _b_api_reject_contact(c: Dict[str, Any]) -> str:
+    return f"/_reject {c['contactReqId']}"
+
+def _b_api_update_profile(c: Dict[str, Any]) -> str:
+    return f"/_profile {c['userId']} {_dumps(c['profile'])}"
+
+def _b_api_set_contact_alias(c: Dict[str, Any]) -> str:
+    return f"/_set alias @{c['contactId']} {c['localAlias'].strip()}"
+
+def _b_new_group(c: Dict[str, Any]) -> str:
+    return f"/_group {_dumps(c['groupProfile'])}"
+
+def _b_api_add_member(c: Dict[str, Any]) -> str:
+    return f"/_add #{c['groupId']} {c['contactId']} {wire(c['memberRole'])}"
+
+def _b_api_join_group(c: Dict[str, Any]) -> str:
+    return f"/_join #{c['groupId']}"
+
+def _b_api_remove_member(c: Dict[str, Any]) -> str:
+    return f"/_remove #{c['groupId']} {c['memberId']}"
+
+def _b_api_leave_group(c: Dict[str, Any]) -> str:
+    return f"/_leave #{c['groupId']}"
+
+def _b_api_list_members(c: Dict[str, Any]) -> str:
+    return f"/_members #{c['groupId']}"
+
+def _b_api_update_group_profile(c: Dict[str, Any]) -> str:
+    return f"/_group_profile #{c['groupId']} {_dumps(c['groupProfile'])}"
+
+def _b_api_contact_info(c: Dict[str, Any]) -> str:
+    return f"/_info @{c['contactId']}"
+
+def _b_api_group_member_info(c: Dict[str, Any]) -> str:
+    return f"/_info #{c['groupId']} {c['memberId']}"
+
+def _b_connect(c: Dict[str, Any]) -> str:
+    return f"/connect {c['connReq']}"
+
+def _b_address_auto_accept(c: Dict[str, Any]) -> str:
+    return f"/auto_accept {auto_accept_str(c.get('autoAccept'))}"
+
+def _b_receive_file(c: Dict[str, Any]) -> str:
+    return f"/freceive {c['fileId']}{' ' + c['filePath'] if c.get('filePath') else ''}"
+
+# Command string builders by the type of the other commands
+_CMD_BUILDERS: Final[Mapping[str, Callable[[Any], str]]] = {
+    "createActiveUser": _b_create_active_user,
+    "startChat": _b_start_chat,
+    "setIncognito": _b_set_incognito,
+    "apiGetChats": _b_api_get_chats,
+    "apiGetChat": _b_api_get_chat,
+    "apiSendMessage": _b_api_send_message,
+    "apiUpdateChatItem": _b_api_update_chat_item,
+    "apiDeleteChatItem": _b_api_delete_chat_item,
+    "apiChatRead": _b_api_chat_read,
+    "apiChatItemsRead": _b_api_chat_items_read,
+    "apiDeleteChat": _b_api_delete_chat,
+    "apiClearChat": _b_api_clear_chat,
+    "apiAcceptContact": _b_api_accept_contact,
+    "apiRejectContact": _b_api_reject_contact,
+    "apiUpdateProfile": _b_api_update_profile,
+    "apiSetContactAlias": _b_api_set_contact_alias,
+    "newGroup": _b_new_group,
+    "apiAddMember": _b_api_add_member,
+    "apiJoinGroup": _b_api_join_group,
+    "apiRemoveMember": _b_api_remove_member,
+    "apiLeaveGroup": _b_api_leave_group,
+    "apiListMembers": _b_api_list_members,
+    "apiUpdateGroupProfile": _b_api_update_group_profile,
+    "apiContactInfo": _b_api_contact_info,
+    "apiGroupMemberInfo": _b_api_group_member_info,
+    "connect": _b_connect,
+    "addressAutoAccept": _b_address_auto_accept,
+    "receiveFile": _b_receive_file,
+}
+
 def cmd_string(cmd: ChatCommand) -> str:
     """Convert a command object to a string."""
-    import json
-    
     cmd_type = cmd["type"]
-
-    # Command string builders using a dictionary for dispatch
-    cmd_builders = {
-        "showActiveUser": lambda _: "/u",
-        "createActiveUser": lambda c: f"/_create user {json.dumps({'profile': c.get('profile'), 'sameServers': c['sameServers'], 'pastTimestamp': c['pastTimestamp']})}",
-        "listUsers": lambda _: "/users",
-        "startChat": lambda c: f"/_start subscribe={on_off(c.get('subscribeConnections'), False)} expire={on_off(c.get('enableExpireChatItems'), False)}",
-        "apiStopChat": lambda _: "/_stop",
-        "setIncognito": lambda c: f"/incognito {on_off(c['incognito'])}",
-        "apiGetChats": lambda c: f"/_get chats pcc={on_off(c.get('pendingConnections'), False)}",
-        "apiGetChat": lambda c: f"/_get chat {c['chatType']}{c['chatId']}{pagination_str(c['pagination'])}" + (f" {c['search']}" if c.get('search') else ""),
-
-        "apiSendMessage": lambda c: f"/_send {c['chatType']}{c['chatId']}" + (" live=on" if c.get("liveMessage") else "") + f" json {json.dumps(c['messages'])}",
-        #"apiSendMessage": lambda c: f"/_send {c['chatType']}{c['chatId']} json {json.dumps(c['messages'])}",
-        "apiUpdateChatItem": lambda c: f"/_update item {c['chatType']}{c['chatId']} {c['chatItemId']}" + (" live=on" if c.get("liveMessage") else "") + f" json {json.dumps(wrappify(c))}",
-        "apiDeleteChatItem": lambda c: f"/_delete item {c['chatType']}{c['chatId']} {c['chatItemId']} {c['deleteMode']}",
-        "apiChatRead": lambda c: f"/_read chat {c['chatType']}{c['chatId']}" + (f" from={c['itemRange']['fromItem']} to={c['itemRange']['toItem']}" if c.get('itemRange') else ""),
-        "apiChatItemsRead": lambda c: f"/_read chat items {c['chatType']}{c['chatId']} " + (str(c['msgIds']) if isinstance(c['msgIds'], int) else ' '.join(str(i) for i in c['msgIds'])),
-        "apiDeleteChat": lambda c: f"/_delete {c['chatType']}{c['chatId']}",
-        "apiClearChat": lambda c: f"/_clear chat {c['chatType']}{c['chatId']}",
-        "apiAcceptContact": lambda c: f"/_accept {c['contactReqId']}",
-        "apiRejectContact": lambda c: f"/_reject {c['contactReqId']}",
-        "apiUpdateProfile": lambda c: f"/_profile {c['userId']} {json.dumps(c['profile'])}",
-        "apiSetContactAlias": lambda c: f"/_set alias @{c['contactId']} {c['localAlias'].strip()}",
-        "newGroup": lambda c: f"/_group {json.dumps(c['groupProfile'])}",
-        "apiAddMember": lambda c: f"/_add #{c['groupId']} {c['contactId']} {c['memberRole']}",
-        "apiJoinGroup": lambda c: f"/_join #{c['groupId']}",
-        "apiRemoveMember": lambda c: f"/_remove #{c['groupId']} {c['memberId']}",
-        "apiLeaveGroup": lambda c: f"/_leave #{c['groupId']}",
-        "apiListMembers": lambda c: f"/_members #{c['groupId']}",
-        "apiUpdateGroupProfile": lambda c: f"/_group_profile #{c['groupId']} {json.dumps(c['groupProfile'])}",
-        "apiContactInfo": lambda c: f"/_info @{c['contactId']}",
-        "apiGroupMemberInfo": lambda c: f"/_info #{c['groupId']} {c['memberId']}",
-        "addContact": lambda _: "/connect",
-        "connect": lambda c: f"/connect {c['connReq']}",
-        "createMyAddress": lambda _: "/address",
-        "deleteMyAddress": lambda _: "/delete_address",
-        "showMyAddress": lambda _: "/show_address",
-        "addressAutoAccept": lambda c: f"/auto_accept {auto_accept_str(c.get('autoAccept'))}",
-        "receiveFile": lambda c: f"/freceive {c['fileId']}{' ' + c['filePath'] if c.get('filePath') else ''}",
-    }
-    
-    if cmd_type in cmd_builders:
-        return cmd_builders[cmd_type](cmd)
-    
-    raise ValueError(f"Unknown command type: {cmd_type}")
+    const = _CONST_CMDS.get(cmd_type)
+    if const is not None:
+        return const
+    try:
+        builder = _CMD_BUILDERS[cmd_type]
+    except KeyError:
+        raise ValueError(f"Unknown command type: {cmd_type}") from None
+    return builder(cmd)
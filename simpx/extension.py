@@ -1,19 +1,58 @@
 import asyncio
-from typing import List, Dict, Optional, Union, Callable, Any, TypeVar, Awaitable, Tuple
-from dataclasses import dataclass
+import functools
+import heapq
+import itertools
+import logging
+import sys
+import time
+from typing import List, Dict, Optional, Union, Callable, Any, TypeVar, Awaitable, Tuple, Iterator, Protocol
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 
 from .client import ChatClient, ChatCommandError
-from .command import ChatType, MsgContent
+from .command import ChatType, DeleteMode, MsgContent
 from .response import ChatResponse, ChatInfo, Contact, Chat, ChatItem, User, GroupInfo, ci_content_text
 
+logger = logging.getLogger(__name__)
+
 # Type for contact or group
 EntityType = Union[Contact, GroupInfo]
 
 # Type for a scheduled task
 TaskType = TypeVar('TaskType')
 
-@dataclass
+class MessageRecipient(Protocol):
+    """Anything scheduled messages can be sent to, such as a contact, group or chat wrapper."""
+    async def send_message(self, text: str) -> Any: ...
+
+# Wrappers are created per chat and per chat item, so they use __slots__
+# where dataclasses support it (Python 3.10+)
+if sys.version_info >= (3, 10):
+    _wrapper = functools.partial(dataclass, slots=True)
+else:
+    _wrapper = dataclass
+
+def _chat_context(chat_info: ChatInfo) -> Optional[Tuple[ChatType, int]]:
+    """Return the chat type and target ID of a chat, or None if it has neither."""
+    chat_type = chat_info.get("type")
+    try:
+        if chat_type == "direct":
+            return ChatType.Direct, chat_info["contact"]["contactId"]
+        elif chat_type == "group":
+            return ChatType.Group, chat_info["groupInfo"]["groupId"]
+        elif chat_type == "contactRequest":
+            return ChatType.ContactRequest, chat_info["contactRequest"]["contactRequestId"]
+    except KeyError:
+        pass
+    return None
+
+# Seconds for which the chat list fetched by SimpleXBotExtensions is reused
+_CHATS_TTL = 5.0
+
+# DeleteMode for each delete_mode string accepted by ChatItemWrapper.delete
+_DELETE_MODE = {"broadcast": DeleteMode.Broadcast, "internal": DeleteMode.Internal}
+
+@_wrapper
 class ContactWrapper:
     """Wrapper for Contact with additional helper methods."""
     _contact: Contact
@@ -72,7 +111,7 @@ class ContactWrapper:
         return self.__str__()
 
 
-@dataclass
+@_wrapper
 class GroupWrapper:
     """Wrapper for GroupInfo with additional helper methods."""
     _group_info: GroupInfo
@@ -139,57 +178,63 @@ class GroupWrapper:
         return self.__str__()
 
 
-@dataclass
+@_wrapper
 class ChatItemWrapper:
     """Wrapper for ChatItem with additional helper methods."""
     _chat_item: ChatItem
     _chat_info: ChatInfo
     _client: ChatClient
     is_live: bool = False 
+    # (chat_type, chat_id) of the chat, resolved once from _chat_info
+    _ctx: Optional[Tuple[ChatType, int]] = field(default=None, init=False, repr=False, compare=False)
+    # The item's "meta" dict, kept in step with _chat_item
+    _meta: Dict[str, Any] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._ctx = _chat_context(self._chat_info)
+        self._meta = self._chat_item.get("meta")
 
     def _get_chat_context(self) -> Tuple[ChatType, int]:
         """Return the chat type and target ID based on chat info."""
-        if self._chat_info["type"] == "direct":
-            return ChatType.Direct, self._chat_info["contact"]["contactId"]
-        elif self._chat_info["type"] == "group":
-            return ChatType.Group, self._chat_info["groupInfo"]["groupId"]
-        else:
-            raise ValueError(f"Unsupported chat type: {self._chat_info['type']}")
+        ctx = self._ctx
+        if ctx is None or ctx[0] is ChatType.ContactRequest:
+            raise ValueError(f"Unsupported chat type: {self._chat_info.get('type')}")
+        return ctx
     
     @property
     def id(self) -> int:
         """Get the chat item ID."""
-        return self._chat_item["meta"]["itemId"]
+        return self._meta["itemId"]
     
     @property
     def text(self) -> str:
         """Get the text content of the message."""
-        return self._chat_item["meta"]["itemText"]
+        return self._meta["itemText"]
     
     @property
     def timestamp(self) -> datetime:
         """Get the timestamp of the message."""
-        return self._chat_item["meta"]["itemTs"]
+        return self._meta["itemTs"]
     
     @property
     def created_at(self) -> datetime:
         """Get the creation time of the message."""
-        return self._chat_item["meta"]["createdAt"]
+        return self._meta["createdAt"]
     
     @property
     def is_deleted(self) -> bool:
         """Check if the message is deleted."""
-        return self._chat_item["meta"]["itemDeleted"]
+        return self._meta["itemDeleted"]
     
     @property
     def is_edited(self) -> bool:
         """Check if the message is edited."""
-        return self._chat_item["meta"]["itemEdited"]
+        return self._meta["itemEdited"]
     
     @property
     def is_editable(self) -> bool:
         """Check if the message is editable."""
-        return self._chat_item["meta"]["editable"]
+        return self._meta["editable"]
     
     @property
     def direction(self) -> Dict[str, Any]:
@@ -204,7 +249,7 @@ class ChatItemWrapper:
     @property
     def status(self) -> Dict[str, Any]:
         """Get the status of the message."""
-        return self._chat_item["meta"]["itemStatus"]
+        return self._meta["itemStatus"]
     
     @property
     def content_text(self) -> Optional[str]:
@@ -213,15 +258,7 @@ class ChatItemWrapper:
     
     async def update(self, msg_content: MsgContent) -> ChatItem:
         """Update the content of the message."""
-        chat_type = ChatType.Direct
-        chat_id = 0
-        
-        if self._chat_info["type"] == "direct":
-            chat_id = self._chat_info["contact"]["contactId"]
-        elif self._chat_info["type"] == "group":
-            chat_type = ChatType.Group
-            chat_id = self._chat_info["groupInfo"]["groupId"]
-        
+        chat_type, chat_id = self._get_chat_context()
         return await self._client.api_update_chat_item(
             chat_type, 
             chat_id, 
@@ -245,6 +282,7 @@ class ChatItemWrapper:
             chat_type, chat_id, self.id, updated_live_message
         )
         self._chat_item = updated_item
+        self._meta = updated_item.get("meta")
         return self
 
     async def finish_live(self) -> 'ChatItemWrapper':
@@ -263,23 +301,14 @@ class ChatItemWrapper:
             chat_type, chat_id, self.id, end_live_message
         )
         self._chat_item = updated_item
+        self._meta = updated_item.get("meta")
         self.is_live = False
         return self
     
     async def delete(self, delete_mode: str = "broadcast") -> Optional[ChatItem]:
         """Delete the message."""
-        from .command import DeleteMode
-        
-        chat_type = ChatType.Direct
-        chat_id = 0
-        
-        if self._chat_info["type"] == "direct":
-            chat_id = self._chat_info["contact"]["contactId"]
-        elif self._chat_info["type"] == "group":
-            chat_type = ChatType.Group
-            chat_id = self._chat_info["groupInfo"]["groupId"]
-        
-        delete_mode_enum = DeleteMode.Broadcast if delete_mode == "broadcast" else DeleteMode.Internal
+        chat_type, chat_id = self._get_chat_context()
+        delete_mode_enum = _DELETE_MODE.get(delete_mode, DeleteMode.Internal)
         
         return await self._client.api_delete_chat_item(
             chat_type, 
@@ -295,11 +324,18 @@ class ChatItemWrapper:
         return self.__str__()
 
 
-@dataclass
+@_wrapper
 class ChatWrapper:
     """Wrapper for Chat with additional helper methods."""
     _chat: ChatInfo
     _client: ChatClient
+    # (chat_type, entity_id) of the chat, resolved once from _chat
+    _ctx: Optional[Tuple[ChatType, int]] = field(default=None, init=False, repr=False, compare=False)
+    # Wrapped chat items, built on the first access to items
+    _items_cache: Optional[List[ChatItemWrapper]] = field(default=None, init=False, repr=False, compare=False)
+    
+    def __post_init__(self):
+        self._ctx = _chat_context(self._chat)
     
     @property
     def info(self) -> ChatInfo:
@@ -313,11 +349,22 @@ class ChatWrapper:
     
     @property
     def items(self) -> List[ChatItemWrapper]:
-        """Get the chat items."""
-        return [
-            ChatItemWrapper(item, self._chat, self._client) 
-            for item in self._chat["chatItems"]
-        ]
+        """Get the chat items, wrapped once and reused on later accesses."""
+        if self._items_cache is None:
+            self._items_cache = list(self.iter_items())
+        return self._items_cache
+    
+    def iter_items(self) -> Iterator[ChatItemWrapper]:
+        """Iterate over the chat items, wrapping each one as it is reached."""
+        return (ChatItemWrapper(item, self._chat, self._client) for item in self._chat["chatItems"])
+    
+    @property
+    def last_item(self) -> Optional[ChatItemWrapper]:
+        """Get the most recent chat item, or None if the chat has none."""
+        chat_items = self._chat["chatItems"]
+        if not chat_items:
+            return None
+        return ChatItemWrapper(chat_items[-1], self._chat, self._client)
     
     @property
     def stats(self) -> Dict[str, Any]:
@@ -339,14 +386,10 @@ class ChatWrapper:
             raise ValueError(f"Unsupported chat type: {self.type}")
 
     async def send_message(self, text: str, live: bool = False, ttl: Optional[int] = None) -> List[Dict[str, Any]]:
-        if self.type == "direct":
-            entity_id = self._chat["contact"]["contactId"]
-            chat_type = ChatType.Direct
-        elif self.type == "group":
-            entity_id = self._chat["groupInfo"]["groupId"]
-            chat_type = ChatType.Group
-        else:
+        ctx = self._ctx
+        if ctx is None or ctx[0] is ChatType.ContactRequest:
             raise ValueError(f"Cannot send message to chat of type: {self.type}")
+        chat_type, entity_id = ctx
 
         # Use the live message API call.
         resp = await self._client.api_send_text_message(
@@ -363,16 +406,10 @@ class ChatWrapper:
     
     async def send_content(self, msg_content: MsgContent) -> List[Dict[str, Any]]:
         """Send complex content to this chat."""
-        chat_type = ChatType.Direct
-        entity_id = 0
-        
-        if self.type == "direct":
-            entity_id = self._chat["contact"]["contactId"]
-        elif self.type == "group":
-            chat_type = ChatType.Group
-            entity_id = self._chat["groupInfo"]["groupId"]
-        else:
+        ctx = self._ctx
+        if ctx is None or ctx[0] is ChatType.ContactRequest:
             raise ValueError(f"Cannot send content to chat of type: {self.type}")
+        chat_type, entity_id = ctx
         
         return await self._client.api_send_messages(
             chat_type,
@@ -382,49 +419,27 @@ class ChatWrapper:
     
     async def mark_as_read(self) -> None:
         """Mark all messages in this chat as read."""
-        chat_type = ChatType.Direct
-        entity_id = 0
-        
-        if self.type == "direct":
-            entity_id = self._chat["contact"]["contactId"]
-        elif self.type == "group":
-            chat_type = ChatType.Group
-            entity_id = self._chat["groupInfo"]["groupId"]
-        else:
+        ctx = self._ctx
+        if ctx is None or ctx[0] is ChatType.ContactRequest:
             raise ValueError(f"Cannot mark chat of type {self.type} as read")
+        chat_type, entity_id = ctx
         
         await self._client.api_chat_read(chat_type, entity_id)
     
     async def clear(self) -> ChatInfo:
         """Clear the chat history."""
-        chat_type = ChatType.Direct
-        entity_id = 0
-        
-        if self.type == "direct":
-            entity_id = self._chat["contact"]["contactId"]
-        elif self.type == "group":
-            chat_type = ChatType.Group
-            entity_id = self._chat["groupInfo"]["groupId"]
-        else:
+        ctx = self._ctx
+        if ctx is None or ctx[0] is ChatType.ContactRequest:
             raise ValueError(f"Cannot clear chat of type {self.type}")
+        chat_type, entity_id = ctx
         
         return await self._client.api_clear_chat(chat_type, entity_id)
     
     async def delete(self) -> None:
         """Delete the chat."""
-        chat_type = ChatType.Direct
-        entity_id = 0
-        
-        if self.type == "direct":
-            entity_id = self._chat["contact"]["contactId"]
-        elif self.type == "group":
-            chat_type = ChatType.Group
-            entity_id = self._chat["groupInfo"]["groupId"]
-        elif self.type == "contactRequest":
-            chat_type = ChatType.ContactRequest
-            entity_id = self._chat["contactRequest"]["contactRequestId"]
-        else:
+        if self._ctx is None:
             raise ValueError(f"Cannot delete chat of type {self.type}")
+        chat_type, entity_id = self._ctx
         
         await self._client.api_delete_chat(chat_type, entity_id)
     
@@ -433,19 +448,9 @@ class ChatWrapper:
         if pagination is None:
             pagination = {"count": 100}
         
-        chat_type = ChatType.Direct
-        entity_id = 0
-        
-        if self.type == "direct":
-            entity_id = self._chat["contact"]["contactId"]
-        elif self.type == "group":
-            chat_type = ChatType.Group
-            entity_id = self._chat["groupInfo"]["groupId"]
-        elif self.type == "contactRequest":
-            chat_type = ChatType.ContactRequest
-            entity_id = self._chat["contactRequest"]["contactRequestId"]
-        else:
+        if self._ctx is None:
             raise ValueError(f"Cannot refresh chat of type {self.type}")
+        chat_type, entity_id = self._ctx
         
         updated_chat = await self._client.api_get_chat(chat_type, entity_id, pagination, search)
         return ChatWrapper(updated_chat, self._client)
@@ -465,7 +470,7 @@ class ChatWrapper:
         return self.__str__()
 
 
-@dataclass
+@_wrapper
 class UserWrapper:
     """Wrapper for User with additional helper methods."""
     _user: User
@@ -508,7 +513,12 @@ class UserWrapper:
 
 
 class ScheduledTask:
-    """A task scheduled for future execution."""
+    """
+    A task scheduled for future execution.
+    
+    Tasks created by SimpleXBotExtensions.schedule_task are run by its
+    scheduler; a standalone task runs on its own once start() is called.
+    """
     
     def __init__(self, 
                  func: Callable[..., Awaitable[Any]], 
@@ -523,6 +533,8 @@ class ScheduledTask:
         self.delay = delay
         self.repeat = repeat
         self.interval = interval
+        # The asyncio task running this task, or its current run when it is
+        # owned by the extensions' scheduler
         self.task = None
         self.cancelled = False
     
@@ -534,8 +546,8 @@ class ScheduledTask:
         while not self.cancelled:
             try:
                 await self.func(*self.args, **self.kwargs)
-            except Exception as e:
-                print(f"Error in scheduled task: {e}")
+            except Exception:
+                logger.exception("Error in scheduled task")
             
             if not self.repeat:
                 break
@@ -543,7 +555,7 @@ class ScheduledTask:
             await asyncio.sleep(self.interval)
     
     def start(self):
-        """Start the scheduled task."""
+        """Start the scheduled task, for tasks not created by schedule_task."""
         self.task = asyncio.create_task(self._run())
         return self.task
     
@@ -561,86 +573,154 @@ class SimpleXBotExtensions:
         """Initialize the extensions with a reference to the bot."""
         self.bot = bot
         self.scheduled_tasks = []
+        # Active user and the bot profile it was fetched for, see get_user
+        self._user_cache: Optional[UserWrapper] = None
+        self._user_profile = None
+        # Chats of the active user by kind, see _get_chat_index
+        self._chats_index: Optional[Dict[str, Any]] = None
+        self._chats_index_ts = 0.0
+        # The client's chats_generation when the index was built
+        self._chats_index_gen = 0
+        self._chats_ttl = _CHATS_TTL
+        # Scheduled tasks by due time, run by a single worker, see _run_scheduler
+        self._sched_heap: List[Tuple[float, int, ScheduledTask]] = []
+        self._sched_counter = itertools.count()
+        self._sched_worker: Optional[asyncio.Task] = None
+        self._sched_wakeup: Optional[asyncio.Event] = None
     
     async def get_user(self) -> UserWrapper:
-        """Get the current active user."""
+        """
+        Get the current active user.
+        
+        The user is fetched once and reused until the bot switches profiles or
+        invalidate_user_cache() is called.
+        """
+        profile = self.bot.profile_manager.current_profile
+        if self._user_cache is not None and self._user_profile is profile:
+            return self._user_cache
+        
         user = await self.bot.client.api_get_active_user()
         if user:
-            return UserWrapper(user, self.bot.client)
+            self._user_cache = UserWrapper(user, self.bot.client)
+            self._user_profile = profile
+            return self._user_cache
         return None
     
-    async def get_contacts(self) -> List[ContactWrapper]:
-        """Get all contacts for the active user."""
+    def invalidate_user_cache(self):
+        """Make the next get_user() call fetch the active user again."""
+        self._user_cache = None
+        self._user_profile = None
+    
+    def invalidate_chats_cache(self):
+        """Make the next chat, contact or group lookup fetch the chat list again."""
+        self._chats_index = None
+    
+    async def _get_chat_index(self) -> Optional[Dict[str, Any]]:
+        """
+        Get the active user's chats, indexed by kind.
+        
+        The chat list is fetched with a single api_get_chats call and reused
+        for a few seconds, until the client sends a command that changes it
+        (such as ContactWrapper.update_alias or ChatWrapper.delete), or until
+        invalidate_chats_cache() is called.
+        
+        Returns:
+            A dict with "contacts" and "groups" (wrappers by ID), "requests"
+            (contact requests), "chats" (the raw chats) and "contact_names"
+            and "group_names" ((lowercased name, wrapper) pairs), or None if
+            there is no active user
+        """
+        client = self.bot.client
+        if (self._chats_index is not None and
+                self._chats_index_gen == client.chats_generation and
+                time.monotonic() - self._chats_index_ts < self._chats_ttl):
+            return self._chats_index
+        
         user = await self.get_user()
         if not user:
-            return []
+            return None
         
-        chats = await self.bot.client.api_get_chats(user.id)
-        contacts = []
+        generation = client.chats_generation
+        chats = await client.api_get_chats(user.id)
+        contacts = {}
+        groups = {}
+        requests = []
         
         for chat in chats:
-            if chat["chatInfo"]["type"] == "direct":
-                contact = chat["chatInfo"]["contact"]
-                contacts.append(ContactWrapper(contact, self.bot.client))
-        
-        return contacts
+            chat_info = chat["chatInfo"]
+            chat_type = chat_info["type"]
+            if chat_type == "direct":
+                contact = ContactWrapper(chat_info["contact"], client)
+                contacts[contact.id] = contact
+            elif chat_type == "group":
+                group = GroupWrapper(chat_info["groupInfo"], client)
+                groups[group.id] = group
+            elif chat_type == "contactRequest":
+                requests.append(chat_info["contactRequest"])
+        
+        self._chats_index = {
+            "contacts": contacts,
+            "groups": groups,
+            "requests": requests,
+            "chats": chats,
+            # Lowercased names for the find_*_by_name searches
+            "contact_names": [(contact.name.lower(), contact) for contact in contacts.values()],
+            "group_names": [(group.name.lower(), group) for group in groups.values()],
+        }
+        self._chats_index_ts = time.monotonic()
+        self._chats_index_gen = generation
+        return self._chats_index
+    
+    async def get_contacts(self) -> List[ContactWrapper]:
+        """Get all contacts for the active user."""
+        index = await self._get_chat_index()
+        if not index:
+            return []
+        return list(index["contacts"].values())
     
     async def get_contact(self, contact_id: int) -> Optional[ContactWrapper]:
         """Get a specific contact by ID."""
-        contacts = await self.get_contacts()
-        for contact in contacts:
-            if contact.id == contact_id:
-                return contact
-        return None
+        index = await self._get_chat_index()
+        if not index:
+            return None
+        return index["contacts"].get(contact_id)
     
     async def find_contact_by_name(self, name: str) -> Optional[ContactWrapper]:
         """Find a contact by name (partial match)."""
-        contacts = await self.get_contacts()
-        for contact in contacts:
-            if name.lower() in contact.name.lower():
-                return contact
-        return None
+        index = await self._get_chat_index()
+        if not index:
+            return None
+        needle = name.lower()
+        return next((contact for lname, contact in index["contact_names"] if needle in lname), None)
     
     async def get_groups(self) -> List[GroupWrapper]:
         """Get all groups for the active user."""
-        user = await self.get_user()
-        if not user:
+        index = await self._get_chat_index()
+        if not index:
             return []
-        
-        chats = await self.bot.client.api_get_chats(user.id)
-        groups = []
-        
-        for chat in chats:
-            if chat["chatInfo"]["type"] == "group":
-                group = chat["chatInfo"]["groupInfo"]
-                groups.append(GroupWrapper(group, self.bot.client))
-        
-        return groups
+        return list(index["groups"].values())
     
     async def get_group(self, group_id: int) -> Optional[GroupWrapper]:
         """Get a specific group by ID."""
-        groups = await self.get_groups()
-        for group in groups:
-            if group.id == group_id:
-                return group
-        return None
+        index = await self._get_chat_index()
+        if not index:
+            return None
+        return index["groups"].get(group_id)
     
     async def find_group_by_name(self, name: str) -> Optional[GroupWrapper]:
         """Find a group by name (partial match)."""
-        groups = await self.get_groups()
-        for group in groups:
-            if name.lower() in group.name.lower():
-                return group
-        return None
+        index = await self._get_chat_index()
+        if not index:
+            return None
+        needle = name.lower()
+        return next((group for lname, group in index["group_names"] if needle in lname), None)
     
     async def get_chats(self) -> List[ChatWrapper]:
         """Get all chats for the active user."""
-        user = await self.get_user()
-        if not user:
+        index = await self._get_chat_index()
+        if not index:
             return []
-        
-        chats = await self.bot.client.api_get_chats(user.id)
-        return [ChatWrapper(chat, self.bot.client) for chat in chats]
+        return [ChatWrapper(chat, self.bot.client) for chat in index["chats"]]
     
     async def get_chat(self, entity: Union[ContactWrapper, GroupWrapper, int], chat_type: str = None) -> Optional[ChatWrapper]:
         """Get a chat by entity (contact, group) or ID."""
@@ -668,31 +748,23 @@ class SimpleXBotExtensions:
         if contacts is None:
             contacts = await self.get_contacts()
         
+        sent = await self.bot.client.api_broadcast_messages(
+            [(ChatType.Direct, contact.id) for contact in contacts],
+            [{"msgContent": {"type": "text", "text": text}}]
+        )
+        
         results = {}
-        for contact in contacts:
-            try:
-                result = await contact.send_message(text)
-                results[contact.id] = result
-            except Exception as e:
-                results[contact.id] = str(e)
+        for contact, result in zip(contacts, sent):
+            results[contact.id] = str(result) if isinstance(result, Exception) else result
         
         return results
     
     async def get_contact_requests(self) -> List[Dict[str, Any]]:
         """Get pending contact requests."""
-        user = await self.get_user()
-        if not user:
+        index = await self._get_chat_index()
+        if not index:
             return []
-        
-        chats = await self.bot.client.api_get_chats(user.id)
-        requests = []
-        
-        for chat in chats:
-            if chat["chatInfo"]["type"] == "contactRequest":
-                request = chat["chatInfo"]["contactRequest"]
-                requests.append(request)
-        
-        return requests
+        return list(index["requests"])
     
     def schedule_task(self, 
                       func: Callable[..., Awaitable[Any]], 
@@ -716,12 +788,63 @@ class SimpleXBotExtensions:
             ScheduledTask object that can be used to cancel the task
         """
         task = ScheduledTask(func, args, kwargs, delay, repeat, interval)
-        task.start()
+        self._push_scheduled(task, asyncio.get_running_loop().time() + delay)
         self.scheduled_tasks.append(task)
         return task
     
+    def _push_scheduled(self, task: ScheduledTask, deadline: float):
+        """Queue a scheduled task to run at deadline (event loop time)."""
+        heap = self._sched_heap
+        heapq.heappush(heap, (deadline, next(self._sched_counter), task))
+        
+        if self._sched_worker is None:
+            self._sched_wakeup = asyncio.Event()
+            self._sched_worker = asyncio.create_task(self._run_scheduler())
+        elif heap[0][2] is task:
+            # The worker is waiting for a later deadline
+            self._sched_wakeup.set()
+    
+    async def _run_scheduler(self):
+        """Start each scheduled task when it is due, until none are left."""
+        heap = self._sched_heap
+        wakeup = self._sched_wakeup
+        loop = asyncio.get_running_loop()
+        try:
+            while heap:
+                deadline, _, task = heap[0]
+                if task.cancelled:
+                    heapq.heappop(heap)
+                    continue
+                
+                delay = deadline - loop.time()
+                if delay > 0:
+                    wakeup.clear()
+                    try:
+                        await asyncio.wait_for(wakeup.wait(), delay)
+                    except asyncio.TimeoutError:
+                        pass
+                    continue
+                
+                heapq.heappop(heap)
+                task.task = asyncio.create_task(self._fire_scheduled(task))
+        finally:
+            # A cancelled worker may already have been replaced
+            if self._sched_worker is asyncio.current_task():
+                self._sched_worker = None
+    
+    async def _fire_scheduled(self, task: ScheduledTask):
+        """Run a scheduled task once, then queue its next run if it repeats."""
+        try:
+            await task.func(*task.args, **task.kwargs)
+        except Exception:
+            logger.exception("Error in scheduled task")
+        
+        # As with ScheduledTask.start(), the interval counts from the end of a run
+        if task.repeat and not task.cancelled:
+            self._push_scheduled(task, asyncio.get_running_loop().time() + task.interval)
+    
     def schedule_message(self, 
-                         recipient: Union[ContactWrapper, GroupWrapper, ChatWrapper], 
+                         recipient: MessageRecipient, 
                          text: str, 
                          delay: float) -> ScheduledTask:
         """
@@ -735,21 +858,14 @@ class SimpleXBotExtensions:
         Returns:
             ScheduledTask object that can be used to cancel the task
         """
-        async def send_delayed_message():
-            try:
-                if isinstance(recipient, ContactWrapper):
-                    await recipient.send_message(text)
-                elif isinstance(recipient, GroupWrapper):
-                    await recipient.send_message(text)
-                elif isinstance(recipient, ChatWrapper):
-                    await recipient.send_message(text)
-            except Exception as e:
-                print(f"Error sending scheduled message: {e}")
-        
-        return self.schedule_task(send_delayed_message, delay=delay)
+        return self.schedule_task(
+            self._send_scheduled_message, 
+            delay=delay, 
+            args=(recipient, text, "scheduled")
+        )
     
     def schedule_recurring_message(self, 
-                                  recipient: Union[ContactWrapper, GroupWrapper, ChatWrapper], 
+                                  recipient: MessageRecipient, 
                                   text: str, 
                                   interval: float, 
                                   start_delay: float = 0) -> ScheduledTask:
@@ -765,27 +881,29 @@ class SimpleXBotExtensions:
         Returns:
             ScheduledTask object that can be used to cancel the task
         """
-        async def send_recurring_message():
-            try:
-                if isinstance(recipient, ContactWrapper):
-                    await recipient.send_message(text)
-                elif isinstance(recipient, GroupWrapper):
-                    await recipient.send_message(text)
-                elif isinstance(recipient, ChatWrapper):
-                    await recipient.send_message(text)
-            except Exception as e:
-                print(f"Error sending recurring message: {e}")
-        
         return self.schedule_task(
-            send_recurring_message, 
+            self._send_scheduled_message, 
             delay=start_delay, 
             repeat=True, 
-            interval=interval
+            interval=interval, 
+            args=(recipient, text, "recurring")
         )
     
+    @staticmethod
+    async def _send_scheduled_message(recipient: MessageRecipient, text: str, kind: str):
+        """Send a scheduled message, reporting rather than raising errors."""
+        try:
+            await recipient.send_message(text)
+        except Exception:
+            logger.exception("Error sending %s message", kind)
+    
     def cancel_all_scheduled_tasks(self):
         """Cancel all scheduled tasks."""
         for task in self.scheduled_tasks:
             task.cancel()
         self.scheduled_tasks = []
+        self._sched_heap.clear()
+        if self._sched_worker is not None:
+            self._sched_worker.cancel()
+            self._sched_worker = None
 
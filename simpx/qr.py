@@ -1,12 +1,22 @@
+import functools
+import sys
+
 import qrcode
-import io
 
-def print_qr_to_terminal(text: str):
+# Block characters for a pair of module rows, indexed by top | bottom << 1.
+# These are the characters qrcode's print_ascii() uses.
+_HALF_BLOCKS = ("\xa0", "▀", "▄", "█")
+
+@functools.lru_cache(maxsize=32)
+def _render_qr_ascii(text: str) -> str:
     """
-    Prints a QR code representing the given text to the terminal.
+    Render the QR code for text as ASCII art, caching the result.
 
     Args:
         text: The string to encode in the QR code.
+
+    Returns:
+        The QR code as lines of block characters.
     """
     qr = qrcode.QRCode(
         version=1,
@@ -16,4 +26,25 @@ def print_qr_to_terminal(text: str):
     )
     qr.add_data(text)
     qr.make(fit=True)
-    qr.print_ascii()
+
+    # The matrix includes the border; each text line covers two of its rows
+    matrix = qr.get_matrix()
+    if len(matrix) % 2:
+        matrix.append([False] * len(matrix[0]))
+    blocks = _HALF_BLOCKS
+    lines = [
+        "".join([blocks[top | bottom << 1] for top, bottom in zip(matrix[r], matrix[r + 1])])
+        for r in range(0, len(matrix), 2)
+    ]
+    lines.append("")
+    return "\n".join(lines)
+
+def print_qr_to_terminal(text: str):
+    """
+    Prints a QR code representing the given text to the terminal.
+
+    Args:
+        text: The string to encode in the QR code.
+    """
+    sys.stdout.write(_render_qr_ascii(text))
+    sys.stdout.flush()
@@ -1,4 +1,5 @@
 import asyncio
+from collections import deque
 from typing import Generic, TypeVar, Optional, AsyncIterator, Union, Any
 
 T = TypeVar('T')
@@ -12,7 +13,7 @@ class ABQueue(Generic[T]):
     
     def __init__(self, max_size: int):
         self.max_size = max_size
-        self.queue = []
+        self.queue = deque()
         self.enq_event = asyncio.Event()
         self.deq_event = asyncio.Event()
         self.deq_event.set()  # Initially can enqueue
@@ -32,6 +33,24 @@ class ABQueue(Generic[T]):
         """Add an item to the queue."""
         await self._enqueue(item)
     
+    def try_enqueue(self, item: T) -> bool:
+        """Add an item if there is room, without waiting. Returns whether it was added."""
+        if self.enq_closed:
+            raise ABQueueError("enqueue: queue closed")
+        
+        if len(self.queue) >= self.max_size:
+            return False
+        
+        self.queue.append(item)
+        
+        # If queue is full, block further enqueues
+        if len(self.queue) >= self.max_size:
+            self.deq_event.clear()
+        
+        # Signal that queue has an item
+        self.enq_event.set()
+        return True
+    
     async def _enqueue(self, item: Union[T, Any]) -> None:
         """Internal method to add any item to the queue."""
         if self.enq_closed:
@@ -57,7 +76,21 @@ class ABQueue(Generic[T]):
         # Wait until there's an item in the queue
         await self.enq_event.wait()
         
-        item = self.queue.pop(0)
+        return self._take()
+    
+    def try_dequeue(self) -> Optional[T]:
+        """Remove and return an item if one is available, otherwise return None."""
+        if self.deq_closed:
+            raise ABQueueError("dequeue: queue closed")
+        
+        if not self.queue:
+            return None
+        
+        return self._take()
+    
+    def _take(self) -> T:
+        """Internal method to remove the next item once one is available."""
+        item = self.queue.popleft()
         
         # If this was the last item, block further dequeues until new items arrive
         if not self.queue:
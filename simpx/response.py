@@ -1114,9 +1114,12 @@ ChatResponse = Union[
     CRChatError,
 ]
 
+# Chat item content types that carry a message
+_MSG_CONTENT_TYPES = frozenset(("sndMsgContent", "rcvMsgContent"))
+
 def ci_content_text(content: CIContent) -> Optional[str]:
     """Extract text from chat item content."""
-    if content["type"] == "sndMsgContent" or content["type"] == "rcvMsgContent":
-        msg_content = content.get("msgContent", {})
-        return msg_content.get("text")
+    if content["type"] in _MSG_CONTENT_TYPES:
+        msg_content = content.get("msgContent")
+        return msg_content.get("text") if msg_content else None
     return None
@@ -1,15 +1,25 @@
 import asyncio
 import json
 import websockets
-from typing import Generic, TypeVar, Dict, Union, Optional, Any, AsyncIterator
+from typing import Generic, TypeVar, Dict, Union, Optional, Any, AsyncIterator, Tuple
 from abc import ABC, abstractmethod
 
 from .queuex import ABQueue, ABQueueError
 from .response import ChatResponse
+from .command import _dumps, _loads
 
 W = TypeVar('W')
 R = TypeVar('R')
 
+if hasattr(asyncio, "timeout"):
+    async def _wait_with_timeout(aw, timeout: float):
+        """Await aw in the current task, raising TimeoutError after timeout seconds."""
+        async with asyncio.timeout(timeout):
+            return await aw
+else:
+    # asyncio.timeout() is only available from Python 3.11
+    _wait_with_timeout = asyncio.wait_for
+
 class TransportError(Exception):
     pass
 
@@ -54,6 +64,8 @@ local_server = ChatServer(host="localhost", port="5225")
 class ChatSrvRequest:
     """Request to the chat server."""
     
+    __slots__ = ("corr_id", "cmd")
+    
     def __init__(self, corr_id: str, cmd: str):
         self.corr_id = corr_id
         self.cmd = cmd
@@ -66,13 +78,6 @@ class ChatResponseError(Exception):
         self.message = message
         self.data = data
 
-class ChatSrvResponse:
-    """Response from the chat server."""
-    
-    def __init__(self, corr_id: Optional[str], resp: ChatResponse):
-        self.corr_id = corr_id
-        self.resp = resp
-
 class WSTransport(Transport[Union[bytes, str], Union[bytes, str]]):
     """WebSocket transport."""
     
@@ -85,7 +90,7 @@ class WSTransport(Transport[Union[bytes, str], Union[bytes, str]]):
     async def connect(cls, url: str, timeout: float, q_size: int) -> 'WSTransport':
         """Connect to a WebSocket server."""
         try:
-            socket = await asyncio.wait_for(websockets.connect(url), timeout)
+            socket = await _wait_with_timeout(websockets.connect(url), timeout)
             transport = cls(socket, timeout, q_size)
             
             # Start task to read messages from socket
@@ -115,7 +120,7 @@ class WSTransport(Transport[Union[bytes, str], Union[bytes, str]]):
     async def write(self, data: Union[bytes, str]) -> None:
         """Send data to the WebSocket."""
         try:
-            await asyncio.wait_for(self.socket.send(data), self.timeout)
+            await _wait_with_timeout(self.socket.send(data), self.timeout)
         except asyncio.TimeoutError:
             raise TimeoutError(f"Write operation timed out after {self.timeout}s")
     
@@ -128,7 +133,12 @@ class WSTransport(Transport[Union[bytes, str], Union[bytes, str]]):
             raise TransportError("Invalid block size")
         return data
 
-class ChatTransport(Transport[ChatSrvRequest, Union[ChatSrvResponse, ChatResponseError]]):
+# An item read from the chat transport: (is_error, corr_id, payload). The
+# payload is a ChatResponseError for errors and the ChatResponse otherwise,
+# with corr_id set only for responses to commands.
+ChatTransportItem = Tuple[bool, Optional[str], Union[ChatResponse, ChatResponseError]]
+
+class ChatTransport(Transport[ChatSrvRequest, ChatTransportItem]):
     """Transport for chat server communication."""
     
     def __init__(self, ws: WSTransport, timeout: float, q_size: int):
@@ -157,22 +167,21 @@ class ChatTransport(Transport[ChatSrvRequest, Union[ChatSrvResponse, ChatRespons
         """Process messages from the WebSocket."""
         async for data in ws:
             if not isinstance(data, str):
-                await self.queue.enqueue(ChatResponseError("WebSocket data is not a string"))
+                await self.queue.enqueue((True, None, ChatResponseError("WebSocket data is not a string")))
                 continue
             
             try:
-                json_data = json.loads(data)
+                json_data = _loads(data)
                 if json_data.get('resp',{}).get('Right'):
                     json_data['resp'] =  json_data['resp']['Right']
                 if json_data.get('resp', {}).get('type') and isinstance(json_data['resp']['type'], str):
-                    # Parse the response as a ChatResponse object
-                    resp = ChatSrvResponse(json_data.get('corrId'), json_data['resp'])
+                    item = (False, json_data.get('corrId'), json_data['resp'])
                 else:
-                    resp = ChatResponseError("Invalid response format", data)
+                    item = (True, None, ChatResponseError("Invalid response format", data))
                 
-                await self.queue.enqueue(resp)
+                await self.queue.enqueue(item)
             except Exception as e:
-                await self.queue.enqueue(ChatResponseError(str(e), data))
+                await self.queue.enqueue((True, None, ChatResponseError(str(e), data)))
         
         await self.queue.close()
     
@@ -182,7 +191,7 @@ class ChatTransport(Transport[ChatSrvRequest, Union[ChatSrvResponse, ChatRespons
     
     async def write(self, cmd: ChatSrvRequest) -> None:
         """Send a request to the chat server."""
-        data = json.dumps({
+        data = _dumps({
             'corrId': cmd.corr_id,
             'cmd': cmd.cmd
         })